@@ -0,0 +1,41 @@
+"""Replace unique index on listings.url with one on a 64-bit url_hash
+
+Revision ID: 3c9f1e7d2a4b
+Revises: 052cc389a82e
+Create Date: 2026-10-15 10:12:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9f1e7d2a4b'
+down_revision: Union[str, None] = '052cc389a82e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('listings', sa.Column('url_hash', sa.BigInteger(), nullable=True))
+    # Same value as database.models.hash_url(): first 8 bytes of md5(url) as a signed bigint
+    op.execute("UPDATE listings SET url_hash = ('x' || substr(md5(url), 1, 16))::bit(64)::bigint")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uix_listings_url_hash "
+            "ON listings (url_hash)"
+        )
+    op.execute(
+        "ALTER TABLE listings ADD CONSTRAINT uix_listings_url_hash "
+        "UNIQUE USING INDEX uix_listings_url_hash"
+    )
+    op.drop_constraint('listings_url_key', 'listings', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('listings_url_key', 'listings', ['url'])
+    op.drop_constraint('uix_listings_url_hash', 'listings', type_='unique')
+    op.drop_column('listings', 'url_hash')
@@ -0,0 +1,41 @@
+"""Index listing_history by (listing_id, changed_date DESC)
+
+Revision ID: 7d2e4b8a1c93
+Revises: 3c9f1e7d2a4b
+Create Date: 2026-10-15 11:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4b8a1c93'
+down_revision: Union[str, None] = '3c9f1e7d2a4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covers "latest price for listing X" as an index-only scan
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_listing_history_listing_changed',
+            'listing_history',
+            ['listing_id', sa.text('changed_date DESC')],
+            postgresql_include=['price', 'change_type'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_listing_history_listing_changed',
+            table_name='listing_history',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
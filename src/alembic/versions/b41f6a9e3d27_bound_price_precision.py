@@ -0,0 +1,37 @@
+"""Bound price columns to NUMERIC(12, 2)
+
+Revision ID: b41f6a9e3d27
+Revises: 7d2e4b8a1c93
+Create Date: 2026-10-15 11:24:53.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f6a9e3d27'
+down_revision: Union[str, None] = '7d2e4b8a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('listings', 'listing_history'):
+        op.alter_column(
+            table, 'price',
+            type_=sa.Numeric(12, 2),
+            existing_type=sa.Numeric(),
+            postgresql_using='round(price, 2)::numeric(12, 2)',
+        )
+
+
+def downgrade() -> None:
+    for table in ('listings', 'listing_history'):
+        op.alter_column(
+            table, 'price',
+            type_=sa.Numeric(),
+            existing_type=sa.Numeric(12, 2),
+        )
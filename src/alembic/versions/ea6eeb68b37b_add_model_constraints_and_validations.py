@@ -5,9 +5,9 @@ Revises: 67ffd44bb76c
 Create Date: 2025-02-11 14:04:13.459225
 
 """
-from typing import Sequence, Union
+from typing import Dict, Sequence, Union
 
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
@@ -18,106 +18,136 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+BACKFILL_BATCH_SIZE = 30000
+
+
+def _backfill(table: str, defaults: Dict[str, str]) -> None:
+    """Replace NULLs with defaults in one pass per table, committed in id-range batches.
+
+    Must run inside an autocommit block so that every batch is its own short
+    transaction instead of one table-sized one, and so that the temporary
+    partial indexes over the NULL rows can be built CONCURRENTLY. With those
+    indexes each batch only visits the rows that actually need a default.
+
+    With --sql there is no connection to read MAX(id) from, so a single
+    unbatched UPDATE is emitted instead.
+    """
+    assignments = ", ".join(
+        f"{column} = COALESCE({column}, {default})" for column, default in defaults.items()
+    )
+    null_check = " OR ".join(f"{column} IS NULL" for column in defaults)
+    if context.is_offline_mode():
+        op.execute(f"UPDATE {table} SET {assignments} WHERE {null_check}")
+        return
+
+    max_id = op.get_bind().execute(sa.text(f"SELECT MAX(id) FROM {table}")).scalar()
+    if max_id is None:
+        return
+
+    null_indexes = {column: f"tmp_idx_{table}_{column}_null" for column in defaults}
+    for column, index_name in null_indexes.items():
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+            f"ON {table} (id) WHERE {column} IS NULL"
+        )
+
+    try:
+        for low in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            op.execute(
+                f"UPDATE {table} SET {assignments} "
+                f"WHERE id >= {low} AND id < {low + BACKFILL_BATCH_SIZE} AND ({null_check})"
+            )
+    finally:
+        for index_name in null_indexes.values():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+
+def _set_not_null(table: str, columns: Sequence[str]) -> None:
+    """SET NOT NULL without holding an ACCESS EXCLUSIVE lock for the scan.
+
+    A NOT VALID CHECK is added and committed first, then validated in its own
+    transaction under the weaker SHARE UPDATE EXCLUSIVE lock. PostgreSQL 12+
+    uses the validated CHECK to skip the verification scan of SET NOT NULL.
+    SET NOT NULL and dropping the helper CHECKs run together in the migration
+    transaction that autocommit_block() reopens, which the next call (or the
+    end of the migration) commits.
+
+    The two ALTERs stay separate statements: within one ALTER TABLE the DROP
+    CONSTRAINT would be applied before SET NOT NULL and bring the scan back.
+    """
+    names = [f"{table}_{column}_notnull" for column in columns]
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} " + ", ".join(
+            f"ADD CONSTRAINT {name} CHECK ({column} IS NOT NULL) NOT VALID"
+            for name, column in zip(names, columns)
+        ))
+        op.execute(f"ALTER TABLE {table} " + ", ".join(
+            f"VALIDATE CONSTRAINT {name}" for name in names
+        ))
+    op.execute(f"ALTER TABLE {table} " + ", ".join(
+        f"ALTER COLUMN {column} SET NOT NULL" for column in columns
+    ))
+    op.execute(f"ALTER TABLE {table} " + ", ".join(
+        f"DROP CONSTRAINT {name}" for name in names
+    ))
+
+
 def upgrade() -> None:
     # First handle existing data
-    op.execute("UPDATE owners SET name = 'Unknown' WHERE name IS NULL")
-    op.execute("UPDATE owners SET source = 'unknown' WHERE source IS NULL")
-    op.execute("UPDATE owners SET external_id = 'unknown' WHERE external_id IS NULL")
-    op.execute("UPDATE owners SET created_at = NOW() WHERE created_at IS NULL")
-    op.execute("UPDATE owners SET updated_at = NOW() WHERE updated_at IS NULL")
-
-    op.execute("UPDATE listings SET source = 'unknown' WHERE source IS NULL")
-    op.execute("UPDATE listings SET external_id = 'unknown' WHERE external_id IS NULL")
-    op.execute("UPDATE listings SET title = 'Unknown' WHERE title IS NULL")
-    op.execute("UPDATE listings SET price = 0 WHERE price IS NULL")
-    op.execute("UPDATE listings SET posted_date = NOW() WHERE posted_date IS NULL")
-    op.execute("UPDATE listings SET processed_date = NOW() WHERE processed_date IS NULL")
-    op.execute("UPDATE listings SET url = CONCAT('unknown_', id) WHERE url IS NULL")
-    op.execute("UPDATE listings SET status = 'active' WHERE status IS NULL")
-    op.execute("UPDATE listings SET created_at = NOW() WHERE created_at IS NULL")
-    op.execute("UPDATE listings SET updated_at = NOW() WHERE updated_at IS NULL")
-
-    op.execute("UPDATE listing_history SET price = 0 WHERE price IS NULL")
-    op.execute("UPDATE listing_history SET changed_date = NOW() WHERE changed_date IS NULL")
-    op.execute("UPDATE listing_history SET change_type = 'NEW' WHERE change_type IS NULL")
-    op.execute("UPDATE listing_history SET created_at = NOW() WHERE created_at IS NULL")
+    with op.get_context().autocommit_block():
+        op.execute("SET jit = off")
+        try:
+            _backfill('owners', {
+                'name': "'Unknown'",
+                'source': "'unknown'",
+                'external_id': "'unknown'",
+                'created_at': "NOW()",
+                'updated_at': "NOW()",
+            })
+            _backfill('listings', {
+                'source': "'unknown'",
+                'external_id': "'unknown'",
+                'title': "'Unknown'",
+                'price': "0",
+                'posted_date': "NOW()",
+                'processed_date': "NOW()",
+                'url': "'unknown_' || id::text",
+                'status': "'active'",
+                'created_at': "NOW()",
+                'updated_at': "NOW()",
+            })
+            _backfill('listing_history', {
+                'price': "0",
+                'changed_date': "NOW()",
+                'change_type': "'NEW'",
+                'created_at': "NOW()",
+            })
+        finally:
+            op.execute("RESET jit")
 
     # Then add the constraints
-    op.alter_column('listing_history', 'listing_id',
-               existing_type=sa.INTEGER(),
-               nullable=False)
-    op.alter_column('listing_history', 'price',
-               existing_type=sa.NUMERIC(),
-               nullable=False)
-    op.alter_column('listing_history', 'changed_date',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
-    op.alter_column('listing_history', 'change_type',
-               existing_type=sa.VARCHAR(length=50),
-               nullable=False)
-    op.alter_column('listing_history', 'created_at',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
-    
+    _set_not_null('listing_history', [
+        'listing_id', 'price', 'changed_date', 'change_type', 'created_at'
+    ])
+
     # Update foreign key constraints
     op.drop_constraint('listing_history_listing_id_fkey', 'listing_history', type_='foreignkey')
     op.create_foreign_key(None, 'listing_history', 'listings', ['listing_id'], ['id'], ondelete='CASCADE')
-    
+
     # Add listings constraints
-    op.alter_column('listings', 'owner_id',
-               existing_type=sa.INTEGER(),
-               nullable=False)
-    op.alter_column('listings', 'source',
-               existing_type=sa.VARCHAR(length=50),
-               nullable=False)
-    op.alter_column('listings', 'external_id',
-               existing_type=sa.VARCHAR(length=100),
-               nullable=False)
-    op.alter_column('listings', 'title',
-               existing_type=sa.TEXT(),
-               nullable=False)
-    op.alter_column('listings', 'price',
-               existing_type=sa.NUMERIC(),
-               nullable=False)
-    op.alter_column('listings', 'posted_date',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
-    op.alter_column('listings', 'processed_date',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
-    op.alter_column('listings', 'url',
-               existing_type=sa.TEXT(),
-               nullable=False)
-    op.alter_column('listings', 'status',
-               existing_type=sa.VARCHAR(length=20),
-               nullable=False)
-    op.alter_column('listings', 'created_at',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
-    op.alter_column('listings', 'updated_at',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
-    
+    _set_not_null('listings', [
+        'owner_id', 'source', 'external_id', 'title', 'price', 'posted_date',
+        'processed_date', 'url', 'status', 'created_at', 'updated_at'
+    ])
+
     # Update listings foreign key
     op.drop_constraint('listings_owner_id_fkey', 'listings', type_='foreignkey')
     op.create_foreign_key(None, 'listings', 'owners', ['owner_id'], ['id'], ondelete='CASCADE')
-    
+
     # Add owners constraints
-    op.alter_column('owners', 'name',
-               existing_type=sa.VARCHAR(length=100),
-               nullable=False)
-    op.alter_column('owners', 'source',
-               existing_type=sa.VARCHAR(length=50),
-               nullable=False)
-    op.alter_column('owners', 'external_id',
-               existing_type=sa.VARCHAR(length=100),
-               nullable=False)
-    op.alter_column('owners', 'created_at',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
-    op.alter_column('owners', 'updated_at',
-               existing_type=postgresql.TIMESTAMP(),
-               nullable=False)
+    _set_not_null('owners', [
+        'name', 'source', 'external_id', 'created_at', 'updated_at'
+    ])
 
 
 def downgrade() -> None:
@@ -0,0 +1,11 @@
+# src/config/_env.py
+import functools
+import os
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=None)
+def load():
+    """Read the .env file into os.environ once per process"""
+    load_dotenv()
+    return os.environ
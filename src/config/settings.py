@@ -1,8 +1,8 @@
 # src/config/settings.py
 import os
-from dotenv import load_dotenv
+from config._env import load
 
-load_dotenv()
+load()
 
 # Telegram settings
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
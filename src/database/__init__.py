@@ -1,5 +1,5 @@
 # src/database/__init__.py
-from .models import Base, Owner, Listing, ListingHistory
+from .models import Base, Owner, Listing, ListingHistory, hash_url
 from .session import get_db_session
 
-__all__ = ['Base', 'Owner', 'Listing', 'ListingHistory', 'get_db_session']
\ No newline at end of file
+__all__ = ['Base', 'Owner', 'Listing', 'ListingHistory', 'hash_url', 'get_db_session']
\ No newline at end of file
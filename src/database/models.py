@@ -1,8 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, func, UniqueConstraint
+import hashlib
+
+from sqlalchemy import event, BigInteger, Column, Integer, String, DateTime, ForeignKey, Index, Numeric, Text, func, UniqueConstraint
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
 
+
+def hash_url(url: str) -> int:
+    """64-bit signed hash of a listing URL, used as the compact dedup key.
+
+    Matches the SQL expression used to backfill existing rows:
+    ('x' || substr(md5(url), 1, 16))::bit(64)::bigint
+    """
+    return int.from_bytes(hashlib.md5(url.encode('utf-8')).digest()[:8], 'big', signed=True)
+
+
+def _url_hash_default(context):
+    url = context.get_current_parameters().get('url')
+    return hash_url(url) if url else None
+
+
 class Owner(Base):
     __tablename__ = 'owners'
     
@@ -24,14 +41,15 @@ class Listing(Base):
     source = Column(String(50))
     external_id = Column(String(100))
     title = Column(Text)
-    price = Column(Numeric)
+    price = Column(Numeric(12, 2))
     square_meters = Column(Integer)
     rooms = Column(String(50))
     description = Column(Text)
     location = Column(String(100))
     posted_date = Column(DateTime)
     processed_date = Column(DateTime)
-    url = Column(Text, unique=True)
+    url = Column(Text)
+    url_hash = Column(BigInteger, default=_url_hash_default)
     status = Column(String(20))
     listing_type = Column(String(20), default='rent')  # 'rent' or 'sale'
     building_condition = Column(String(50), nullable=True)  # For sales
@@ -42,19 +60,29 @@ class Listing(Base):
     
     __table_args__ = (
         UniqueConstraint('source', 'external_id', name='uix_source_external_id'),
+        UniqueConstraint('url_hash', name='uix_listings_url_hash'),
     )
 
     owner = relationship("Owner", back_populates="listings")
     history = relationship("ListingHistory", back_populates="listing")
 
+@event.listens_for(Listing.url, 'set')
+def _sync_url_hash(target, value, oldvalue, initiator):
+    target.url_hash = hash_url(value) if value else None
+
 class ListingHistory(Base):
     __tablename__ = 'listing_history'
     
     id = Column(Integer, primary_key=True)
     listing_id = Column(Integer, ForeignKey('listings.id'))
-    price = Column(Numeric)
+    price = Column(Numeric(12, 2))
     changed_date = Column(DateTime)
     change_type = Column(String(50))
     created_at = Column(DateTime, default=func.now())
     
+    __table_args__ = (
+        Index('ix_listing_history_listing_changed', 'listing_id', changed_date.desc(),
+              postgresql_include=['price', 'change_type']),
+    )
+
     listing = relationship("Listing", back_populates="history")
\ No newline at end of file
@@ -1,15 +1,18 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
-from dotenv import load_dotenv
 import os
+import functools
+from contextlib import contextmanager
 import logging
 from tenacity import retry, stop_after_attempt, wait_exponential
+from config._env import load
 
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+load()
 
+@functools.lru_cache(maxsize=None)
 def get_database_url():
     db_url = os.getenv('DATABASE_URL')
     if 'localhost' in db_url:
@@ -25,26 +28,33 @@ engine = create_engine(
     pool_timeout=60,         # Added timeout
     pool_pre_ping=True,
     pool_recycle=3600,
+    use_insertmanyvalues=True,               # executemany() INSERTs go out as multi-row VALUES
+    insertmanyvalues_page_size=500,
+    executemany_mode='values_plus_batch',    # UPDATE/DELETE executemany via psycopg2 execute_batch
+    executemany_batch_page_size=500,
+    query_cache_size=1200,   # Room for every scraper's lookup/insert/update variants across threads
     echo=False               # Set to True for SQL debugging if needed
 )
 
 # Create session factory
 Session = sessionmaker(bind=engine)
-SessionFactory = scoped_session(Session)
 
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-def get_db_session():
+def _create_session():
     try:
-        session = SessionFactory()
-        return session
+        return Session()
     except Exception as e:
         logger.error(f"Error creating database session: {e}")
         raise
-    
-def cleanup_db_session(session):
-    """Helper function to properly cleanup database sessions"""
+
+@contextmanager
+def get_db_session():
+    """Yield a session that is always closed when the block exits"""
+    session = _create_session()
     try:
-        session.close()
-        SessionFactory.remove()
-    except Exception as e:
-        logger.error(f"Error cleaning up database session: {e}")
\ No newline at end of file
+        yield session
+    finally:
+        try:
+            session.close()
+        except Exception as e:
+            logger.error(f"Error cleaning up database session: {e}")
\ No newline at end of file
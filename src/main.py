@@ -1,11 +1,11 @@
 import sys
 from pathlib import Path
 import signal
-import time
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 import os
 import threading
+import functools
 from scrapers.base_scraper import ACTIVE_SCRAPERS
 
 # Add the src directory to the Python path
@@ -13,9 +13,8 @@ src_path = str(Path(__file__).parent)
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-# Global flag for controlling scrapers
-running = True
-running_lock = threading.Lock()
+# Set once to stop all scrapers; waiting on it doubles as an interruptible sleep
+stop_event = threading.Event()
 
 # Set up logging
 logging.basicConfig(
@@ -28,6 +27,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
 def validate_environment():
     """Validate required environment variables are set"""
     required = ['TELEGRAM_BOT_TOKEN', 'DATABASE_URL', 'GOOGLE_SHEETS_ID']
@@ -63,38 +63,25 @@ def initialize_database():
 
 def signal_handler(signum, frame):
     """Handle interrupt signal"""
-    global running
-    with running_lock:
-        running = False
+    stop_event.set()
     logger.info("\nStopping scrapers gracefully... Please wait.")
 
-def run_scraper(scraper_config):
-    """Run scraper with interrupt checking"""
+def run_scraper(scraper_config, database_ready):
+    """Run scraper with interrupt checking once database_ready has completed"""
     scraper_class, bot_token, chat_id = scraper_config
     scraper = None
     try:
         logger.info(f"Starting {scraper_class.__name__}")
         scraper = scraper_class(bot_token, chat_id)
-        
-        while True:
-            with running_lock:
-                if not running:
-                    break
-                
-            try:
-                scraper.run()
-            except Exception as e:
-                logger.error(f"Error in {scraper_class.__name__}: {e}")
-                time.sleep(90)  # Wait before retrying
-            
-            # Check running flag every 5 seconds
-            for _ in range(12):  # 1 minute in 5-second increments
-                with running_lock:
-                    if not running:
-                        return
-                time.sleep(5)
+        # Construction overlaps with table creation; raises if initialize_database failed
+        database_ready.result()
+
+        # Returns once stop_event is set; each scraper cycles on its own thread and driver
+        scraper.run(stop_event)
     except Exception as e:
         logger.error(f"Critical error in {scraper_class.__name__}: {e}")
+        # Surface the crash to main(), which stops the other scrapers
+        raise
     finally:
         if scraper:
             try:
@@ -106,14 +93,10 @@ def main():
     try:
         # Ensure directories exist first
         ensure_directories()
-        
+
         # Validate environment variables
         validate_environment()
 
-        # Initialize database
-        initialize_database()
-        
-        
         # Import scrapers after ensuring directories
         from scrapers import (
             OglasiScraper,
@@ -135,19 +118,28 @@ def main():
         logger.info(f"Starting {len(scrapers)} scrapers")
 
         # Use ThreadPoolExecutor for better thread management
-        with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
-            futures = [executor.submit(run_scraper, scraper_config) for scraper_config in scrapers]
+        with ThreadPoolExecutor(max_workers=len(scrapers) + 1) as executor:
+            # Connecting and creating tables overlaps with the scrapers building
+            # their Sheets clients and Telegram sessions
+            database_ready = executor.submit(initialize_database)
+            futures = [executor.submit(run_scraper, scraper_config, database_ready) for scraper_config in scrapers]
 
             try:
-                # Wait for all futures to complete or until interrupted
-                for future in futures:
-                    future.result()
+                # Return as soon as startup or any scraper fails instead of waiting on them in order
+                done, _ = wait([database_ready, *futures], return_when=FIRST_EXCEPTION)
+                failed = [future for future in done if future.exception() is not None]
+                for future in failed:
+                    logger.error(f"Scraper thread failed: {future.exception()}")
+                if failed:
+                    stop_event.set()
+                    executor.shutdown(wait=True, cancel_futures=True)
             except KeyboardInterrupt:
                 logger.info("\nReceived keyboard interrupt. Stopping scrapers...")
-                global running
-                running = False
+                stop_event.set()
                 executor.shutdown(wait=True)
 
+        # Database initialization errors stop startup as they did before the overlap
+        database_ready.result()
         logger.info("All scrapers stopped.")
 
     except Exception as e:
@@ -1,15 +1,29 @@
 # src/scrapers/__init__.py
+import importlib
+
 from .base_scraper import BaseScraper, ProcessedLink, ACTIVE_SCRAPERS
 
-# Active scrapers
-from .oglasi_scraper import OglasiScraper
-from .oglasi_sales_scraper import OglasiSalesScraper
+# Scraper classes are imported on first access so that importing one
+# scraper doesn't load every other site's module
+_SCRAPER_MODULES = {
+    # Active scrapers
+    'OglasiScraper': 'oglasi_scraper',
+    'OglasiSalesScraper': 'oglasi_sales_scraper',
+    # Portfolio scrapers - available but not running in production
+    'CetiriZidaScraper': 'cetiri_zida_scraper',
+    'HaloOglasiScraper': 'halooglasi_scraper',
+    'NekretnineRSScraper': 'nekretnine_scraper',
+    'SasoMangeScraper': 'sasomange_scraper',
+}
+
 
-# Portfolio scrapers - available but not running in production
-from .cetiri_zida_scraper import CetiriZidaScraper
-from .halooglasi_scraper import HaloOglasiScraper
-from .nekretnine_scraper import NekretnineRSScraper
-from .sasomange_scraper import SasoMangeScraper
+def __getattr__(name):
+    module_name = _SCRAPER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    scraper_class = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = scraper_class
+    return scraper_class
 
 # Only export active scrapers for main.py
 __all__ = [
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
-import json
+import functools
+import mmap
+import queue
+import random
+import orjson
 import time
 from datetime import datetime, timedelta
 import threading
@@ -10,54 +14,126 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from typing import Set, Optional
+from typing import Dict, List, Set, Optional, Tuple, Union
 from pathlib import Path
+from io import BytesIO
 import shutil
 import os
 import sys
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 from webdriver_manager.chrome import ChromeDriverManager
 from database.session import get_db_session
-from database.models import Listing, Owner, ListingHistory
-from sqlalchemy import or_, and_
+from database.models import Listing, Owner, ListingHistory, hash_url
+from sqlalchemy import or_, and_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from utils.sheets_helper import GoogleSheetsHelper
-from config import GOOGLE_SHEETS_CREDS, GOOGLE_SHEETS_ID
+from utils.rate_limiter import RateLimiter
+from utils.parsing import parse_square_meters
+from config import GOOGLE_SHEETS_CREDS, GOOGLE_SHEETS_ID, MAX_PAGES
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
 import ssl
-from typing import Optional
 from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 # Create necessary directories
 os.makedirs('data/logs', exist_ok=True)
 os.makedirs('data/processed_links', exist_ok=True)
 
+# Records are formatted by the QueueHandler and written to file/stdout by a
+# background listener, so worker threads never block on log I/O
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.FileHandler('data/logs/scraper.log', encoding='utf-8'),
+    logging.StreamHandler(sys.stdout)
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('data/logs/scraper.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)  
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-# Metrics
-LISTINGS_PROCESSED = Counter('listings_processed_total', 'Number of listings processed')
-LISTINGS_SKIPPED = Counter('listings_skipped_total', 'Number of duplicate listings skipped')
-DB_CONNECTION_ERRORS = Counter('db_connection_errors_total', 'Number of database connection errors')
-CONNECTION_POOL_FULL = Counter('connection_pool_full_total', 'Number of times connection pool was full')
-SCRAPING_ERRORS = Counter('scraping_errors_total', 'Number of scraping errors')
-ACTIVE_SCRAPERS = Gauge('active_scrapers', 'Number of active scrapers')
+# Metrics (SCRAPER_METRICS=0 swaps them for no-ops)
+METRICS_ENABLED = os.getenv('SCRAPER_METRICS', '1') == '1'
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+def _metric(metric_class, *args, **kwargs):
+    return metric_class(*args, **kwargs) if METRICS_ENABLED else _NoopMetric()
+
+
+# status is one of 'processed', 'skipped' (duplicate) or 'error'
+LISTINGS_TOTAL = _metric(Counter, 'listings_total', 'Number of listings handled', ['source', 'status'])
+DB_CONNECTION_ERRORS = _metric(Counter, 'db_connection_errors_total', 'Number of database connection errors')
+CONNECTION_POOL_FULL = _metric(Counter, 'connection_pool_full_total', 'Number of times connection pool was full')
+ACTIVE_SCRAPERS = _metric(Gauge, 'active_scrapers', 'Number of active scrapers')
+SHEETS_ROWS_DROPPED = _metric(Counter, 'sheets_rows_dropped_total', 'Listings not sent to Google Sheets because the queue was full')
+
+# Google Sheets rows are written in the background, this many per API call
+SHEETS_QUEUE_SIZE = 1000
+SHEETS_BATCH_SIZE = 50
+SHEETS_BATCH_WAIT = 2.0
+
+# Telegram notifications are sent in order by one background thread per scraper
+TELEGRAM_QUEUE_SIZE = 100
+# Photos queued within TELEGRAM_BATCH_WAIT seconds of each other go out as one album, up to Telegram's limit
+TELEGRAM_MEDIA_GROUP_SIZE = 10
+TELEGRAM_BATCH_WAIT = 2.0
+# A batch also closes once nothing new arrives for this long, so a lone notification isn't held the full wait
+TELEGRAM_BATCH_IDLE = 0.5
+# Text-only notifications in one batch are joined into digests of at most this many characters
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Up to this many seconds are added to each wait so scrapers don't hit their sites in lockstep
+CYCLE_JITTER = 30
+
+
+# Rendered /metrics payload, reused by scrapes that arrive within METRICS_CACHE_TTL seconds
+METRICS_CACHE_TTL = 1.0
+_metrics_cache_lock = threading.Lock()
+_metrics_cache = (float('-inf'), b'')
+
+
+def _render_metrics() -> bytes:
+    global _metrics_cache
+    with _metrics_cache_lock:
+        rendered_at, payload = _metrics_cache
+        now = time.monotonic()
+        if now - rendered_at >= METRICS_CACHE_TTL:
+            payload = generate_latest()
+            _metrics_cache = (now, payload)
+        return payload
 
 
 class MetricsHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         if self.path == '/metrics':
+            payload = _render_metrics()
             self.send_response(200)
             self.send_header('Content-Type', CONTENT_TYPE_LATEST)
             self.end_headers()
-            self.wfile.write(generate_latest())
+            self.wfile.write(payload)
         elif self.path == '/health':
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
@@ -72,23 +148,63 @@ class MetricsHandler(BaseHTTPRequestHandler):
         pass
 
 
+# Certificate checks are disabled on purpose (see InsecureHTTPAdapter), don't warn per request
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Retries connection errors and transient 5xx/429 responses with exponential backoff
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=['GET', 'HEAD']
+)
+
+
+def _insecure_ssl_context() -> ssl.SSLContext:
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+# Built once per process and shared by every scraper's connection pools
+INSECURE_SSL_CONTEXT = _insecure_ssl_context()
+
+
+class InsecureHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools share one SSL context with verification disabled"""
+
+    def __init__(self, *args, **kwargs):
+        self.ssl_context = INSECURE_SSL_CONTEXT
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        return super().proxy_manager_for(*args, **kwargs)
+
+
 class ProcessedLink:
-    def __init__(self, url: str, timestamp: datetime = None):
+    """A processed URL and when it was seen
+
+    Hashes and compares equal to its plain url string, so `url in processed_links`
+    is an O(1) set lookup without building a separate set of URLs.
+    """
+    __slots__ = ('url', 'ts')
+
+    def __init__(self, url: str, ts: Optional[int] = None):
         self.url = url
-        self.timestamp = timestamp or datetime.now()
+        self.ts = ts if ts is not None else int(time.time())  # epoch seconds
 
     def to_dict(self):
-        return {
-            'url': self.url,
-            'timestamp': self.timestamp.isoformat()
-        }
+        return {'u': self.url, 't': self.ts}
 
     @staticmethod
     def from_dict(data):
-        return ProcessedLink(
-            data['url'],
-            datetime.fromisoformat(data['timestamp'])
-        )
+        return ProcessedLink(data['u'], data['t'])
 
     def __eq__(self, other):
         return self.url == other.url if isinstance(other, ProcessedLink) else self.url == other
@@ -100,6 +216,67 @@ class BaseScraper(ABC):
     _instance_lock = threading.Lock()
     _active_instances = set()
     _metrics_started = False
+    # chromedriver binary resolved by webdriver_manager, shared by every scraper
+    _chromedriver_path: Optional[str] = None
+    # Value of Listing.source for this site; defaults to the class name without "Scraper"
+    _source_name: Optional[str] = None
+    # source label on this scraper's metrics; defaults to _source_name
+    _metrics_label: Optional[str] = None
+    # How far back a matching source/external_id counts as a duplicate (None = forever)
+    duplicate_window: Optional[timedelta] = timedelta(hours=24)
+
+    _USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    _CHROME_ARGS = (
+        # Headless and security settings
+        '--headless=new',
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-blink-features=AutomationControlled',
+        # SSL handling
+        '--ignore-certificate-errors',
+        '--ignore-ssl-errors',
+        '--allow-insecure-localhost',
+        '--ssl-version-max=tls1.2',
+        '--ssl-version-min=tls1',
+        '--allow-running-insecure-content',
+        '--disable-web-security',
+        '--disable-aia-fetch',
+        # Performance and detection avoidance
+        '--disable-gpu',
+        '--enable-unsafe-swiftshader',
+        '--disable-notifications',
+        '--disable-popup-blocking',
+        '--start-maximized',
+        '--disable-extensions',
+        '--blink-settings=imagesEnabled=false',
+        '--window-size=1920,1080',
+        f'--user-agent={_USER_AGENT}',
+    )
+    # Photos are re-downloaded through make_request, so Chrome doesn't need to fetch them
+    _CHROME_EXPERIMENTAL = {
+        'excludeSwitches': ['enable-automation'],
+        'useAutomationExtension': False,
+        'prefs': {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        },
+    }
+    # Evasion techniques applied over CDP once the driver is up
+    _UA_OVERRIDE = {'userAgent': _USER_AGENT}
+    _WEBDRIVER_STEALTH = {
+        'source': '''
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            })
+        '''
+    }
+    # Anything smaller is a spacer or "no photo" tile rather than a listing photo
+    MIN_IMAGE_BYTES = 3 * 1024
+    # Larger bodies aren't listing thumbnails; stop reading instead of buffering them
+    MAX_IMAGE_BYTES = 5 * 1024 * 1024
+    _PLACEHOLDER_IMAGE_MARKERS = ('no-image', 'placeholder', 'lazy')
+    # Requests per second allowed through make_request, or None for no limit
+    request_rate: Optional[float] = None
 
     def __init__(self, 
                  bot_token: str,
@@ -112,16 +289,33 @@ class BaseScraper(ABC):
         self.processed_links_path = Path(processed_links_path)
         logger.debug(f"After conversion: {self.processed_links_path} (type: {type(self.processed_links_path)})")
         self.wait_time = wait_time
+        # Pages scanned per cycle; the scan also stops at the first empty page
+        self.max_pages = MAX_PAGES
         self.driver = None
         self.wait = None
+        self.body_wait = None
         self.instance_id = id(self)
+        if self._source_name is None:
+            self._source_name = type(self).__name__.removesuffix('Scraper').lower()
+        metrics_label = self._metrics_label or self._source_name
+        # Bind the per-scraper label children once instead of on every increment
+        self._listings_processed = LISTINGS_TOTAL.labels(source=metrics_label, status='processed')
+        self._listings_skipped = LISTINGS_TOTAL.labels(source=metrics_label, status='skipped')
+        self._scraping_errors = LISTINGS_TOTAL.labels(source=metrics_label, status='error')
+        # url -> existing Listing (or None) for the page currently being processed
+        self._known_listings: Dict[str, Optional[Listing]] = {}
+        # Loaded from processed_links_path on the first run_cycle
+        self.processed_links: Optional[Set[ProcessedLink]] = None
+        # (listing_data, owner_data) pairs from save_listing, written once per page
+        self._pending_listings: List[Tuple[dict, dict]] = []
+        self._pending_lock = threading.Lock()
         self.sheets_helper = GoogleSheetsHelper(GOOGLE_SHEETS_CREDS, GOOGLE_SHEETS_ID)
         
         # Start metrics server only once
         with self._instance_lock:
             if not BaseScraper._metrics_started:
                 try:
-                    server = HTTPServer(('0.0.0.0', 8000), MetricsHandler)
+                    server = ThreadingHTTPServer(('0.0.0.0', 8000), MetricsHandler)
                     thread = threading.Thread(target=server.serve_forever, daemon=True)
                     thread.start()
                     BaseScraper._metrics_started = True
@@ -133,12 +327,40 @@ class BaseScraper(ABC):
         
         self.processed_links_path.parent.mkdir(parents=True, exist_ok=True)
         self._file_lock = threading.Lock()
+        self._links_file = None
+
+        self._sheets_q = queue.Queue(maxsize=SHEETS_QUEUE_SIZE)
+        self._sheets_thread = threading.Thread(
+            target=self._sheets_worker,
+            name=f'{self.__class__.__name__}-sheets',
+            daemon=True
+        )
+        self._sheets_thread.start()
+
+        self._telegram_q = queue.Queue(maxsize=TELEGRAM_QUEUE_SIZE)
+        self._telegram_thread = threading.Thread(
+            target=self._telegram_worker,
+            name=f'{self.__class__.__name__}-telegram',
+            daemon=True
+        )
+        self._telegram_thread.start()
+
+        # Listing workers live as long as the scraper instead of being rebuilt per page
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('SCRAPER_WORKERS', '3')),
+            thread_name_prefix=self.__class__.__name__
+        )
 
         self.http_session = requests.Session()
-        from requests.adapters import HTTPAdapter
-        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=3)
+        self.http_session.verify = False
+        self.http_session.headers.update({
+            'User-Agent': self._USER_AGENT,
+            'Connection': 'keep-alive',
+        })
+        adapter = InsecureHTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=HTTP_RETRY)
         self.http_session.mount('http://', adapter)
         self.http_session.mount('https://', adapter)
+        self._rate_limiter = RateLimiter(self.request_rate) if self.request_rate else None
 
     def __enter__(self):
         return self
@@ -150,23 +372,150 @@ class BaseScraper(ABC):
         except Exception as e:
             logger.error(f"Cleanup error: {e}")
         finally:
+            self._executor.shutdown(wait=True)
+            self.flush_pending_listings()
+            self._stop_sheets_worker()
+            self._stop_telegram_worker()
+            with self._file_lock:
+                self._close_links_file()
             with self._instance_lock:
                 self._active_instances.discard(self.instance_id)
 
-    def make_request(self, url: str, timeout: int = 10) -> Optional[requests.Response]:
+    def _sheets_worker(self):
+        """Send queued listings to Google Sheets in batches until a None sentinel arrives"""
+        while True:
+            batch = [self._sheets_q.get()]
+            deadline = time.monotonic() + SHEETS_BATCH_WAIT
+            while len(batch) < SHEETS_BATCH_SIZE and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._sheets_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            rows = [row for row in batch if row is not None]
+            if rows:
+                try:
+                    self.sheets_helper.append_listings_batch(rows)
+                except Exception as sheets_error:
+                    logger.error(f"Google Sheets error: {sheets_error}")
+            if len(rows) < len(batch):
+                return
+
+    def _stop_sheets_worker(self, timeout: float = 30):
         try:
-            # Create a custom SSL context
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            # Use the custom context in requests
-            response = self.http_session.get(
-                url, 
-                timeout=timeout,
-                verify=False,  # Disable SSL verification
-                stream=True
-            )
+            self._sheets_q.put(None, timeout=timeout)
+            self._sheets_thread.join(timeout)
+        except queue.Full:
+            logger.warning("Google Sheets queue still full at shutdown, pending rows dropped")
+
+    def queue_telegram(self, photo: Optional[BytesIO], caption: str, reply_markup: Optional[Dict] = None):
+        """Hand a notification to _telegram_worker; blocks only while the queue is full"""
+        self._telegram_q.put((photo, caption, reply_markup))
+
+    def _telegram_worker(self):
+        """Send queued notifications through self.telegram until a None sentinel arrives"""
+        while True:
+            batch = [self._telegram_q.get()]
+            deadline = time.monotonic() + TELEGRAM_BATCH_WAIT
+            while len(batch) < TELEGRAM_MEDIA_GROUP_SIZE and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._telegram_q.get(timeout=min(remaining, TELEGRAM_BATCH_IDLE)))
+                except queue.Empty:
+                    break
+
+            items = [item for item in batch if item is not None]
+            albums = [item for item in items if item[0]]
+            if len(albums) > 1 and self._send_telegram_album(albums):
+                items = [item for item in items if not item[0]]
+            texts = [item for item in items if not item[0]]
+            if len(texts) > 1:
+                self._send_telegram_digest(texts)
+                items = [item for item in items if item[0]]
+
+            for photo, caption, reply_markup in items:
+                try:
+                    if photo:
+                        self.telegram.send_photo(photo, caption, reply_markup=reply_markup)
+                    else:
+                        self.telegram.send_message(caption, reply_markup=reply_markup)
+                except Exception as e:
+                    logger.error(f"Telegram failed: {e}")
+            if len(items) < len(batch) and batch[-1] is None:
+                return
+
+    def _send_telegram_album(self, items) -> bool:
+        """Send photo notifications as one album plus a message holding their link buttons"""
+        try:
+            result = self.telegram.send_media_group([(photo, caption) for photo, caption, _ in items])
+            if not result.get('ok'):
+                return False
+        except Exception as e:
+            logger.error(f"Telegram album failed: {e}")
+            return False
+
+        rows = self._numbered_link_rows(items)
+        if rows:
+            try:
+                self.telegram.send_message("🔗 Linkovi za oglase iznad", reply_markup={'inline_keyboard': rows})
+            except Exception as e:
+                logger.error(f"Telegram failed: {e}")
+        return True
+
+    def _send_telegram_digest(self, items):
+        """Send text notifications as few messages as fit TELEGRAM_MESSAGE_LIMIT, with their link buttons"""
+        chunks = [[]]
+        length = 0
+        for item in items:
+            size = len(item[1]) + 2
+            if chunks[-1] and length + size > TELEGRAM_MESSAGE_LIMIT:
+                chunks.append([])
+                length = 0
+            chunks[-1].append(item)
+            length += size
+
+        for chunk in chunks:
+            rows = self._numbered_link_rows(chunk)
+            try:
+                self.telegram.send_message(
+                    '\n\n'.join(caption for _, caption, _ in chunk),
+                    reply_markup={'inline_keyboard': rows} if rows else None
+                )
+            except Exception as e:
+                logger.error(f"Telegram failed: {e}")
+
+    @staticmethod
+    def _numbered_link_rows(items) -> List[List[Dict]]:
+        """Merge the items' keyboards, numbering buttons in item order since one message carries them all"""
+        return [
+            [{**button, 'text': f"{i}. {button['text']}"} for button in row]
+            for i, (_, _, reply_markup) in enumerate(items, 1)
+            for row in (reply_markup or {}).get('inline_keyboard', [])
+        ]
+
+    def _stop_telegram_worker(self, timeout: float = 60):
+        try:
+            self._telegram_q.put(None, timeout=timeout)
+            self._telegram_thread.join(timeout)
+        except queue.Full:
+            logger.warning("Telegram queue still full at shutdown, pending notifications dropped")
+        finally:
+            if not self._telegram_thread.is_alive():
+                self.telegram.close()
+
+    def make_request(self, url: str, timeout: Union[float, Tuple[float, float]] = (3, 10), *,
+                     stream: bool = False) -> Optional[requests.Response]:
+        """GET a URL through the pooled session; streamed responses must be used as a context manager"""
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
+        try:
+            # Unless streaming, the body is read eagerly so the connection goes straight back to the pool
+            response = self.http_session.get(url, timeout=timeout, stream=stream)
             response.raise_for_status()
             return response
         except requests.exceptions.SSLError:
@@ -176,66 +525,89 @@ class BaseScraper(ABC):
             logger.error(f"Request error: {e}")
             return None
 
+    def is_real_image_url(self, url: Optional[str]) -> bool:
+        """Reject inline/blank sources and known placeholder images before any request is made"""
+        if not url or url.startswith(('data:', 'about:blank')):
+            return False
+        lowered = url.lower()
+        return not any(marker in lowered for marker in self._PLACEHOLDER_IMAGE_MARKERS)
+
+    def fetch_listing_photo(self, url: Optional[str]) -> Optional[BytesIO]:
+        """Download a listing photo for send_photo, or None if it is missing or a placeholder"""
+        if not self.is_real_image_url(url):
+            return None
+        content = self._download_image(url)
+        if content is None:
+            return None
+        photo = BytesIO(content)
+        photo.name = 'image.jpg'
+        return photo
+
+    def _download_image(self, url: str) -> Optional[bytes]:
+        response = self.make_request(url, stream=True)
+        if response is None:
+            return None
+        with response:
+            # Check the header before pulling the body so placeholders cost no transfer
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit():
+                if int(content_length) < self.MIN_IMAGE_BYTES:
+                    logger.debug(f"Skipping placeholder image ({content_length} bytes): {url}")
+                    return None
+                if int(content_length) > self.MAX_IMAGE_BYTES:
+                    logger.warning(f"Skipping oversized image ({content_length} bytes): {url}")
+                    return None
+
+            buffer = BytesIO()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                buffer.write(chunk)
+                if buffer.tell() > self.MAX_IMAGE_BYTES:
+                    logger.warning(f"Skipping oversized image (over {self.MAX_IMAGE_BYTES} bytes): {url}")
+                    return None
+        if buffer.tell() < self.MIN_IMAGE_BYTES:
+            logger.debug(f"Skipping placeholder image ({buffer.tell()} bytes): {url}")
+            return None
+        return buffer.getvalue()
+
     def clean_chromedriver(self):
         try:
             chrome_driver_path = os.path.join(os.path.expanduser('~'), '.wdm', 'drivers', 'chromedriver')
             if os.path.exists(chrome_driver_path):
                 shutil.rmtree(chrome_driver_path, ignore_errors=True)
+            with BaseScraper._instance_lock:
+                BaseScraper._chromedriver_path = None
         except Exception as e:
             logger.warning(f"Could not clean ChromeDriver directory: {e}")
 
+    @classmethod
+    def chromedriver_path(cls) -> str:
+        """Resolve the chromedriver binary once per process"""
+        with BaseScraper._instance_lock:
+            if BaseScraper._chromedriver_path is None:
+                BaseScraper._chromedriver_path = ChromeDriverManager().install()
+            return BaseScraper._chromedriver_path
+
     def setup_driver(self) -> webdriver.Chrome:
         try:
             options = webdriver.ChromeOptions()
+            for argument in self._CHROME_ARGS:
+                options.add_argument(argument)
+            for name, value in self._CHROME_EXPERIMENTAL.items():
+                options.add_experimental_option(name, value)
+            options.page_load_strategy = 'eager'
             
-            # Headless and security settings
-            options.add_argument('--headless=new')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # SSL handling
-            options.add_argument('--ignore-certificate-errors')
-            options.add_argument('--ignore-ssl-errors')
-            options.add_argument('--allow-insecure-localhost')
-            options.add_argument('--ssl-version-max=tls1.2')
-            options.add_argument('--ssl-version-min=tls1')
-            options.add_argument('--allow-running-insecure-content')
-            options.add_argument('--disable-web-security')
-            options.add_argument('--disable-aia-fetch')
-            
-            # Performance and detection avoidance
-            options.add_argument('--disable-gpu')
-            options.add_argument('--enable-unsafe-swiftshader')
-            options.add_argument('--disable-notifications')
-            options.add_argument('--disable-popup-blocking')
-            options.add_argument('--start-maximized')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument(f'--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            
-            service = Service(ChromeDriverManager().install())
+            service = Service(self.chromedriver_path(), service_args=['--silent'])
             self.driver = webdriver.Chrome(service=service, options=options)
             
             # Evasion techniques
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            
-            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': '''
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    })
-                '''
-            })
+            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', self._UA_OVERRIDE)
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', self._WEBDRIVER_STEALTH)
             
             # Timeout configurations
-            self.driver.set_page_load_timeout(30)
-            self.driver.implicitly_wait(10)
+            # Explicit waits only; an implicit wait would stack on top of every WebDriverWait
+            self.driver.set_page_load_timeout(20)
             self.wait = WebDriverWait(self.driver, 15)
+            self.body_wait = WebDriverWait(self.driver, 5)
             
             return self.driver
             
@@ -243,14 +615,45 @@ class BaseScraper(ABC):
             logger.error(f"Error setting up Chrome driver: {e}")
             raise
 
+    def _driver_healthy(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def quit_driver(self):
+        """Stop Chrome; ensure_driver() starts a fresh one when it is next needed"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Error quitting driver: {e}")
+            self.driver = None
+
+    def _restart_driver(self) -> webdriver.Chrome:
+        self.quit_driver()
+        return self.setup_driver()
+
+    def ensure_driver(self) -> webdriver.Chrome:
+        """Return the running driver, starting a new one only if it is missing or dead"""
+        if not self._driver_healthy():
+            logger.info(f"Starting Chrome driver for {self.__class__.__name__}")
+            self._restart_driver()
+        return self.driver
+
     def verify_page_loaded(self):
         try:
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'body')))
-            body_text = self.driver.find_element(By.CSS_SELECTOR, 'body').text
+            # body exists as soon as DOMContentLoaded fires, which is all 'eager' waits for
+            body = self.body_wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+            body_text = body.text
             
             if not body_text:
                 logger.warning("Page loaded but no content found")
-                logger.debug(f"Page source: {self.driver.page_source[:500]}...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Page source: {self.driver.page_source[:500]}...")
                 return False
                 
             return True
@@ -259,107 +662,375 @@ class BaseScraper(ABC):
             return False
 
     def normalize_url(self, url: str) -> str:
-        return url.split('?')[0] if '?' in url else url
+        return url.partition('?')[0]
+
+    def listing_key(self, listing) -> Optional[Tuple[str, str]]:
+        """Return (url, external_id) for a page element so run() can prefetch duplicates"""
+        return None
+
+    def check_listings_exist_bulk(self, pairs: List[Tuple[str, str]],
+                                  now: Optional[datetime] = None) -> Dict[str, Listing]:
+        """Look up many (url, external_id) pairs in one query, keyed by the requested url"""
+        if not pairs:
+            return {}
+
+        with get_db_session() as db:
+            return self._find_existing_bulk(db, pairs, now)
+
+    def _find_existing_bulk(self, db, pairs: List[Tuple[str, str]],
+                            now: Optional[datetime] = None) -> Dict[str, Listing]:
+        url_by_hash = {hash_url(url): url for url, _ in pairs}
+        url_by_external_id = {external_id: url for url, external_id in pairs}
+        external_id_match = and_(
+            Listing.source == self._source_name,
+            Listing.external_id.in_(url_by_external_id)
+        )
+        if self.duplicate_window is not None:
+            external_id_match = and_(
+                external_id_match,
+                Listing.processed_date >= (now or datetime.now()) - self.duplicate_window
+            )
+
+        rows = db.query(Listing).filter(
+            or_(Listing.url_hash.in_(url_by_hash), external_id_match)
+        ).all()
+
+        found = {}
+        for row in rows:
+            url = url_by_hash.get(row.url_hash)
+            if url is None and row.source == self._source_name:
+                url = url_by_external_id.get(row.external_id)
+            if url is not None:
+                found.setdefault(url, row)
+        return found
+
+    def prefetch_existing_listings(self, listings, processed_links: Set[ProcessedLink] = frozenset(),
+                                   now: Optional[datetime] = None) -> list:
+        """Resolve duplicate checks for a whole page with a single query
+
+        Returns the listings still worth handing to workers: links already in
+        processed_links are dropped here instead of occupying a worker slot.
+        """
+        self._known_listings = {}
+        fresh = []
+        pairs = []
+        for listing in listings:
+            try:
+                key = self.listing_key(listing)
+            except Exception as e:
+                logger.debug(f"Could not read listing key: {e}")
+                key = None
+            if key and key[0] in processed_links:
+                self._listings_skipped.inc()
+                continue
+            fresh.append(listing)
+            if key:
+                pairs.append(key)
+
+        if len(fresh) < len(listings):
+            logger.info(f"Skipping {len(listings) - len(fresh)} already processed listings")
 
-    def check_listing_exists(self, url: str, external_id: str) -> tuple[bool, Optional[Listing]]:
-        db = get_db_session()
         try:
-            existing = db.query(Listing).filter(
-                or_(
-                    Listing.url == url,
-                    and_(
-                        Listing.source == self.__class__.__name__.replace('Scraper', '').lower(),
-                        Listing.external_id == external_id,
-                        Listing.processed_date >= datetime.now() - timedelta(hours=24)
-                    )
-                )
-            ).first()
-            return bool(existing), existing
+            found = self.check_listings_exist_bulk(pairs, now)
         except Exception as e:
-            logger.error(f"Database check error: {e}")
-            return False, None
-        finally:
-            db.close()
+            logger.error(f"Database bulk check error: {e}")
+            return fresh
+        self._known_listings = {url: found.get(url) for url, _ in pairs}
+        return fresh
+
+    def check_listing_exists(self, url: str, external_id: str,
+                             now: Optional[datetime] = None) -> tuple[bool, Optional[Listing]]:
+        if url in self._known_listings:
+            existing = self._known_listings[url]
+            return bool(existing), existing
+
+        with get_db_session() as db:
+            try:
+                existing = self.find_existing_listing(db, url, external_id, now)
+                # Later checks of the same link on this page are answered from memory
+                self._known_listings[url] = existing
+                return bool(existing), existing
+            except Exception as e:
+                logger.error(f"Database check error: {e}")
+                return False, None
+
+    def find_existing_listing(self, db, url: str, external_id: str,
+                              now: Optional[datetime] = None) -> Optional[Listing]:
+        """Look a listing up by url_hash first, then by source/external_id"""
+        # Two single-index probes; an OR of both would need a BitmapOr over two indexes
+        existing = db.query(Listing).filter(Listing.url_hash == hash_url(url)).first()
+        if existing:
+            return existing
+
+        query = db.query(Listing).filter(
+            Listing.source == self._source_name,
+            Listing.external_id == external_id
+        )
+        if self.duplicate_window is not None:
+            query = query.filter(Listing.processed_date >= (now or datetime.now()) - self.duplicate_window)
+        return query.first()
 
     def get_db_session(self):
         return get_db_session()
 
     def save_listing(self, listing_data: dict, owner_data: dict):
-        db = get_db_session()
-        try:
-            # Check for existing listing
-            is_duplicate, existing_listing = self.check_listing_exists(
-                listing_data['url'], 
-                listing_data['external_id']
-            )
+        """Queue a listing for the next flush_pending_listings()"""
+        with self._pending_lock:
+            self._pending_listings.append((listing_data, owner_data))
+
+    def flush_pending_listings(self):
+        """Write queued listings in one transaction, falling back to a savepoint per listing"""
+        # Links of the same page reach the log in one write, alongside their rows
+        self.flush_processed_links()
+        with self._pending_lock:
+            pending, self._pending_listings = self._pending_listings, []
+        if not pending:
+            return
 
-            if existing_listing:
-                # Update existing listing if price changed
-                if existing_listing.price != listing_data['price']:
-                    history = ListingHistory(
-                        listing_id=existing_listing.id,
-                        price=existing_listing.price,
-                        changed_date=datetime.now(),
-                        change_type='price_change'
-                    )
-                    db.add(history)
-                    for key, value in listing_data.items():
-                        setattr(existing_listing, key, value)
+        with get_db_session() as db:
+            try:
+                inserted = self._save_listings_bulk(db, pending)
                 db.commit()
-                logger.info(f"Updated listing: {listing_data['url']}")
-                return
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Bulk save failed, saving listings one by one: {e}")
+                try:
+                    inserted = self._save_listings_rowwise(db, pending)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Database error: {e}")
+                    return
 
-            # Handle owner
-            owner = db.query(Owner).filter(
-                Owner.source == owner_data['source'],
-                Owner.external_id == owner_data['external_id']
-            ).first()
-
-            if not owner:
-                owner = Owner(**owner_data)
-                db.add(owner)
-                db.flush()
-
-            # Create new listing
-            listing_data['owner_id'] = owner.id
-            listing = Listing(**listing_data)
-            db.add(listing)
-            db.commit()
-            
-            # Google Sheets integration
+        # Google Sheets integration, written by _sheets_worker
+        for listing_data in inserted:
             try:
-                self.sheets_helper.append_listing(listing_data)
-            except Exception as sheets_error:
-                logger.error(f"Google Sheets error: {sheets_error}")
+                self._sheets_q.put_nowait(listing_data)
+            except queue.Full:
+                SHEETS_ROWS_DROPPED.inc()
+                logger.warning(f"Google Sheets queue full, dropped: {listing_data['url']}")
 
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Database error: {e}")
-        finally:
-            db.close()
+    def _save_listings_bulk(self, db, pending: List[Tuple[dict, dict]]) -> List[dict]:
+        """Save a page of listings with one lookup and one INSERT per table; returns the inserted rows"""
+        # The first entry for a url wins, as the row-by-row path would then only see it as existing
+        by_url = {}
+        for listing_data, owner_data in pending:
+            by_url.setdefault(listing_data['url'], (listing_data, owner_data))
+
+        existing = self._find_existing_bulk(
+            db, [(url, listing_data['external_id']) for url, (listing_data, _) in by_url.items()]
+        )
+
+        new = []
+        for url, (listing_data, owner_data) in by_url.items():
+            existing_listing = existing.get(url)
+            if existing_listing is None:
+                new.append((listing_data, owner_data))
+                continue
+            # Update existing listing if price changed
+            if existing_listing.price != listing_data['price']:
+                db.add(ListingHistory(
+                    listing_id=existing_listing.id,
+                    price=existing_listing.price,
+                    changed_date=datetime.now(),
+                    change_type='price_change'
+                ))
+                for key, value in listing_data.items():
+                    setattr(existing_listing, key, value)
+            logger.info(f"Updated listing: {url}")
+
+        if not new:
+            return []
+
+        # Owners: one lookup, then one multi-row INSERT for the missing ones
+        owners = {(owner_data['source'], owner_data['external_id']): owner_data for _, owner_data in new}
+        owner_ids = {}
+        for source, external_id, owner_id in db.query(Owner.source, Owner.external_id, Owner.id).filter(
+            tuple_(Owner.source, Owner.external_id).in_(list(owners))
+        ):
+            owner_ids.setdefault((source, external_id), owner_id)
+        missing = [owner_data for key, owner_data in owners.items() if key not in owner_ids]
+        if missing:
+            created = db.execute(
+                pg_insert(Owner).returning(Owner.source, Owner.external_id, Owner.id),
+                missing
+            )
+            for source, external_id, owner_id in created:
+                owner_ids[(source, external_id)] = owner_id
+
+        # Listings: sale rows carry extra columns, and each executemany needs one key set
+        groups = {}
+        for listing_data, owner_data in new:
+            listing_data['owner_id'] = owner_ids[(owner_data['source'], owner_data['external_id'])]
+            groups.setdefault(frozenset(listing_data), []).append(listing_data)
+
+        inserted_urls = set()
+        for rows in groups.values():
+            # The unique constraints decide if another writer got there first
+            result = db.execute(pg_insert(Listing).on_conflict_do_nothing().returning(Listing.url), rows)
+            inserted_urls.update(result.scalars())
+
+        inserted = [listing_data for listing_data, _ in new if listing_data['url'] in inserted_urls]
+        if len(inserted) < len(new):
+            logger.info(f"{len(new) - len(inserted)} listing(s) already saved by another writer")
+        return inserted
+
+    def _save_listings_rowwise(self, db, pending: List[Tuple[dict, dict]]) -> List[dict]:
+        """Save listings one savepoint at a time, so a bad row only loses itself"""
+        inserted = []
+        for listing_data, owner_data in pending:
+            try:
+                with db.begin_nested():
+                    if self._save_listing_row(db, listing_data, owner_data):
+                        inserted.append(listing_data)
+            except Exception as e:
+                logger.error(f"Database error for {listing_data.get('url')}: {e}")
+        return inserted
+
+    def _save_listing_row(self, db, listing_data: dict, owner_data: dict) -> bool:
+        """Insert or update one listing without committing; True if it was inserted"""
+        existing_listing = self.find_existing_listing(
+            db,
+            listing_data['url'],
+            listing_data['external_id']
+        )
+
+        if existing_listing:
+            # Update existing listing if price changed
+            if existing_listing.price != listing_data['price']:
+                history = ListingHistory(
+                    listing_id=existing_listing.id,
+                    price=existing_listing.price,
+                    changed_date=datetime.now(),
+                    change_type='price_change'
+                )
+                db.add(history)
+                for key, value in listing_data.items():
+                    setattr(existing_listing, key, value)
+            logger.info(f"Updated listing: {listing_data['url']}")
+            return False
+
+        # Handle owner
+        owner = db.query(Owner).filter(
+            Owner.source == owner_data['source'],
+            Owner.external_id == owner_data['external_id']
+        ).first()
+
+        if not owner:
+            owner = Owner(**owner_data)
+            db.add(owner)
+            db.flush()
+
+        # Create new listing; the unique constraints decide if another writer got there first
+        listing_data['owner_id'] = owner.id
+        result = db.execute(pg_insert(Listing).values(**listing_data).on_conflict_do_nothing())
+        if result.rowcount == 0:
+            logger.info(f"Listing already saved by another writer: {listing_data['url']}")
+            return False
+        return True
+
+    def _close_links_file(self) -> None:
+        if self._links_file is not None:
+            self._links_file.close()
+            self._links_file = None
 
     def load_processed_links(self) -> Set[ProcessedLink]:
+        """Read the JSONL link log, keeping entries from the last 24 hours"""
         with self._file_lock:
             try:
-                if not self.processed_links_path.exists():
+                path = Path(self.processed_links_path)
+                if not path.exists():
+                    return self._import_legacy_links(path)
+                if path.stat().st_size == 0:
                     return set()
 
-                with open(self.processed_links_path, 'r') as f:
-                    data = json.load(f)
-                    links = {ProcessedLink.from_dict(item) for item in data}
-                    cutoff = datetime.now() - timedelta(hours=24)
-                    return {link for link in links if link.timestamp >= cutoff}
+                cutoff = int(time.time()) - 86400
+                links = set()
+                stale = 0
+                with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    start = 0
+                    size = len(data)
+                    while start < size:
+                        end = data.find(b'\n', start)
+                        if end == -1:
+                            end = size
+                        line = data[start:end]
+                        start = end + 1
+                        if not line.strip():
+                            continue
+                        try:
+                            link = ProcessedLink.from_dict(orjson.loads(line))
+                        except (ValueError, KeyError):
+                            stale += 1
+                            continue
+                        if link.ts >= cutoff:
+                            links.discard(link)
+                            links.add(link)
+                        else:
+                            stale += 1
+
+                # Drop expired lines so the log only grows by one day's worth of links
+                if stale:
+                    self._rewrite_links_file(links)
+                return links
             except Exception as e:
                 logger.error(f"Error loading links: {e}")
                 return set()
 
+    def _import_legacy_links(self, path: Path) -> Set[ProcessedLink]:
+        """Carry the last 24 hours of the old JSON array file over into a new JSONL log, once"""
+        legacy_path = path.with_suffix('.json')
+        if not legacy_path.exists():
+            return set()
+
+        cutoff = int(time.time()) - 86400
+        with open(legacy_path, 'rb') as f:
+            data = orjson.loads(f.read())
+        links = set()
+        for item in data:
+            ts = int(datetime.fromisoformat(item['timestamp']).timestamp())
+            if ts >= cutoff:
+                links.add(ProcessedLink(item['url'], ts))
+
+        self._rewrite_links_file(links)
+        # Kept rather than deleted, but out of the way so it is never imported twice
+        legacy_path.replace(legacy_path.with_name(legacy_path.name + '.migrated'))
+        logger.info(f"Imported {len(links)} links from {legacy_path} into {path}")
+        return links
+
+    def append_processed_link(self, link: ProcessedLink) -> None:
+        """Append one link to the JSONL log; flush_processed_links() writes it out"""
+        with self._file_lock:
+            try:
+                if self._links_file is None:
+                    self._links_file = open(self.processed_links_path, 'ab')
+                self._links_file.write(orjson.dumps(link.to_dict()) + b'\n')
+            except Exception as e:
+                logger.error(f"Error saving link: {e}")
+
+    def flush_processed_links(self) -> None:
+        """Write buffered link log lines to disk in one go"""
+        with self._file_lock:
+            try:
+                if self._links_file is not None:
+                    self._links_file.flush()
+            except Exception as e:
+                logger.error(f"Error flushing links: {e}")
+
+    def _rewrite_links_file(self, links: Set[ProcessedLink]) -> None:
+        path = Path(self.processed_links_path)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.writelines(orjson.dumps(link.to_dict()) + b'\n' for link in links)
+        # The append handle still points at the replaced file
+        self._close_links_file()
+        temp_path.replace(path)
+
     def save_processed_links(self, links: Set[ProcessedLink]) -> None:
+        """Replace the JSONL log with exactly these links"""
         with self._file_lock:
             try:
-                temp_path = self.processed_links_path.with_suffix('.tmp')
-                with open(temp_path, 'w') as f:
-                    json.dump([link.to_dict() for link in links], f)
-                temp_path.replace(self.processed_links_path)
+                self._rewrite_links_file(links)
             except Exception as e:
                 logger.error(f"Error saving links: {e}")
 
@@ -369,57 +1040,81 @@ class BaseScraper(ABC):
 
     @abstractmethod
     def get_page_listings(self):
+        """Cards on the page the driver is on, as plain dicts for the workers; used by the default load_page"""
         pass
 
+    def load_page(self, page_url: str) -> Tuple[list, bool]:
+        """Open a list page and return (cards, whether another page may follow)
+
+        An empty card list ends the scan. Scrapers that can read list pages
+        without Chrome override this and fall back to it.
+        """
+        self.ensure_driver()
+        self.driver.get(page_url)
+        if not self.verify_page_loaded():
+            return [], False
+        return self.get_page_listings(), True
+
     @abstractmethod
-    def process_listing(self, listing, processed_links: Set[ProcessedLink]) -> bool:
+    def process_listing(self, listing, *, processed_links: Set[ProcessedLink]) -> bool:
         pass
 
-    def run(self):
-        processed_links = self.load_processed_links()
-        
-        while True:
-            driver = None
-            try:
-                driver = self.setup_driver()
-                self.driver = driver
-                logger.info(f"Starting scan cycle for {self.__class__.__name__}")
-                
-                for page in range(1, 3):  # Limit to 3 pages for testing
-                    page_url = self.get_page_url(page)
-                    logger.info(f"Processing page {page}: {page_url}")
-                    
-                    try:
-                        self.driver.get(page_url)
-                        if not self.verify_page_loaded():
-                            break
-                        
-                        listings = self.get_page_listings()
-                        if not listings:
-                            break
-                            
-                        with ThreadPoolExecutor(max_workers=3) as executor:
-                            results = list(executor.map(
-                                lambda l: self.process_listing(l, processed_links),
-                                listings
-                            ))
-                            
-                        new_count = len([r for r in results if not r])
-                        logger.info(f"Page {page}: {new_count} new listings")
-                        
-                    except Exception as e:
-                        logger.error(f"Page {page} error: {e}")
-                        break
-
-                logger.info(f"Cycle complete. Waiting {self.wait_time}s")
-                time.sleep(self.wait_time)
+    def get_processed_links(self) -> Set[ProcessedLink]:
+        if self.processed_links is None:
+            self.processed_links = self.load_processed_links()
+        return self.processed_links
 
+    def run(self, stop_event: Optional[threading.Event] = None):
+        """Repeat run_cycle every wait_time seconds until stop_event is set"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            try:
+                # One duplicate-window reference time for every page of the cycle
+                self.run_cycle(datetime.now())
             except Exception as e:
                 logger.error(f"Critical error: {e}")
-                time.sleep(60)
+                stop_event.wait(60)
+                continue
             finally:
-                if driver:
-                    try:
-                        driver.quit()
-                    except:
-                        pass
\ No newline at end of file
+                # Pages that broke off before their own flush still get written
+                self.flush_pending_listings()
+                # Chrome isn't kept resident while the scraper sleeps
+                self.quit_driver()
+
+            delay = self.wait_time + random.uniform(0, CYCLE_JITTER)
+            logger.info(f"Cycle complete. Waiting {delay:.0f}s")
+            stop_event.wait(delay)
+
+    def run_cycle(self, cycle_now: Optional[datetime] = None):
+        """Scan up to max_pages listing pages once; cycle_now anchors every duplicate check"""
+        processed_links = self.get_processed_links()
+        process_one = functools.partial(self.process_listing, processed_links=processed_links)
+
+        logger.info(f"Starting scan cycle for {self.__class__.__name__}")
+        cycle_now = cycle_now or datetime.now()
+
+        for page in range(1, self.max_pages + 1):
+            page_url = self.get_page_url(page)
+            logger.info(f"Processing page {page}: {page_url}")
+
+            try:
+                listings, has_next = self.load_page(page_url)
+                if not listings:
+                    break
+
+                listings = self.prefetch_existing_listings(listings, processed_links, now=cycle_now)
+                # process_listing returns True for duplicates
+                new_count = sum(
+                    1 for is_duplicate in self._executor.map(process_one, listings)
+                    if not is_duplicate
+                )
+                self.flush_pending_listings()
+                logger.info(f"Page {page}: {new_count} new listings")
+
+                if not has_next:
+                    logger.info("No more pages available")
+                    break
+
+            except Exception as e:
+                logger.error(f"Page {page} error: {e}")
+                break
\ No newline at end of file
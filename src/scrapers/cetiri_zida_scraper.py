@@ -2,31 +2,132 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from io import BytesIO
 import requests
-import time
 from datetime import datetime
-from typing import Set
+from typing import Dict, List, Set
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from .base_scraper import DB_CONNECTION_ERRORS, LISTINGS_PROCESSED, LISTINGS_SKIPPED, SCRAPING_ERRORS, BaseScraper, ProcessedLink
+import re
+from .base_scraper import BaseScraper, ProcessedLink, parse_square_meters
 from utils.telegram import TelegramNotifier
-from database.session import get_db_session, SessionFactory  
 from html import escape
 from typing import Tuple, Optional
-from sqlalchemy import or_, and_
-from database.models import Listing
 
 
 logger = logging.getLogger(__name__)
 
+# One '•'-separated part of the card details: either an area like "1.200 m²" or a room description
+_DETAILS_RE = re.compile(
+    r'(?:^|•)\s*(?:(?P<sqm>\d+(?:[.,]\d+)*\s*m²)|(?P<rooms>[^•]*?(?:soban|garsonjera)[^•]*?))\s*(?=•|$)',
+    re.IGNORECASE
+)
+_PRICE_RE = re.compile(r'\d+')
+
 class CetiriZidaScraper(BaseScraper):
+    _source_name = '4zida.rs'
+    duplicate_window = None
+    # Candidate selectors for 4zida listing cards, tried in order
+    LISTING_SELECTORS = (
+        '[test-data="ad-search-card"]',      # Original
+        '[data-testid="ad-search-card"]',    # Alternative
+        '.search-results .card',             # Generic card
+        '.listing-card',                     # Generic listing
+        '.property-card',                    # Property card
+        'div[class*="card"]',                # Any div with "card"
+        'article',                           # Semantic article
+        '.ad-item',                          # Ad item
+        '[class*="listing"]',                # Any class with "listing"
+        '[class*="property"]'                # Any class with "property"
+    )
+    PROPERTY_INDICATORS = ('€', 'din', 'eur', 'm²', 'm2', 'soban', 'stan', 'garsonjera')
+    # Text fields read from each card; the first selector with non-empty text wins
+    CARD_TEXT_SELECTORS = {
+        'title': ('p.truncate.font-medium', '.title', 'h3', '[class*="title"]'),
+        'price': ('p.rounded-tl.bg-spotlight', '.price', '[class*="price"]'),
+        'location': ('p.line-clamp-2', '.location', '[class*="location"]'),
+        'details': ('a.px-3.text-sm', '.details', '[class*="details"]'),
+        'info': ('div.flex-1.text-2xs', '.info', '.description'),
+    }
+    IMAGE_SELECTORS = ('img[alt*="4zida.rs"]', 'img[src*="4zida"]', 'img', '.image img')
+    # Reads every card on the page in one WebDriver call instead of ~15 calls per card.
+    # Cards share a layout, so the selector that matched the previous card is tried first.
+    EXTRACT_CARDS_JS = '''
+        const [cards, textSelectors, linkSelectors, imageSelectors] = arguments;
+        const preferred = {};
+        const textAt = (card, selector) => {
+            const el = card.querySelector(selector);
+            return el && el.innerText.trim();
+        };
+        const firstText = (card, name, selectors) => {
+            const last = preferred[name];
+            const lastText = last && textAt(card, last);
+            if (lastText) return lastText;
+            for (const selector of selectors) {
+                if (selector === last) continue;
+                const text = textAt(card, selector);
+                if (text) {
+                    preferred[name] = selector;
+                    return text;
+                }
+            }
+            return null;
+        };
+        return cards.map(card => {
+            const data = {};
+            for (const [name, selectors] of Object.entries(textSelectors)) {
+                data[name] = firstText(card, name, selectors);
+            }
+            data.href = null;
+            for (const selector of linkSelectors) {
+                const link = card.querySelector(selector);
+                if (link) { data.href = link.href; break; }
+            }
+            data.img = null;
+            for (const selector of imageSelectors) {
+                const img = card.querySelector(selector);
+                if (img && img.src) { data.img = img.src.split('#')[0]; break; }
+            }
+            return data;
+        });
+    '''
+    # Scrolls until the page stops growing, entirely in the browser; resolves with the scroll count
+    SCROLL_TO_END_JS = '''
+        const [maxScrolls, growWaitMs, pollMs, done] = arguments;
+        let lastHeight = document.body.scrollHeight;
+        let scrolls = 0;
+        const scroll = () => {
+            if (scrolls >= maxScrolls) return done(scrolls);
+            window.scrollTo(0, document.body.scrollHeight);
+            const start = Date.now();
+            const poll = () => {
+                const height = document.body.scrollHeight;
+                if (height > lastHeight) {
+                    lastHeight = height;
+                    scrolls++;
+                    scroll();
+                } else if (Date.now() - start >= growWaitMs) {
+                    done(scrolls);
+                } else {
+                    setTimeout(poll, pollMs);
+                }
+            };
+            poll();
+        };
+        scroll();
+    '''
+    LINK_SELECTORS = (
+        'a[href*="/izdavanje-stanova/"]',
+        'a[href*="4zida.rs"]',
+        'a[href*="/ad/"]',
+        'a[href]'
+    )
+
     def __init__(self, bot_token: str, chat_id: str):
         super().__init__(
             bot_token=bot_token,
             chat_id=chat_id,
-            processed_links_path='data/processed_links/4zida_links.json'
+            processed_links_path='data/processed_links/4zida_links.jsonl'
         )
+        self._winning_selector = None
         self.telegram = TelegramNotifier(bot_token, chat_id)
         logger.info("CetiriZidaScraper initialized successfully")
         
@@ -47,43 +148,44 @@ class CetiriZidaScraper(BaseScraper):
         """Scroll through page to trigger lazy loading"""
         try:
             logger.info("Starting scroll to trigger lazy loading...")
-            
-            # Initial wait for page to load
-            time.sleep(3)
-            
-            # Get initial page height
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            scroll_attempts = 0
+
             max_scroll_attempts = 5
-            
-            while scroll_attempts < max_scroll_attempts:
-                logger.info(f"Scroll attempt {scroll_attempts + 1}/{max_scroll_attempts}")
-                
-                # Scroll down in increments
-                self.driver.execute_script("window.scrollTo(0, 1000);")
-                time.sleep(2)
-                self.driver.execute_script("window.scrollTo(0, 2000);")
-                time.sleep(2)
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(3)
-                
-                # Check if new content loaded
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    logger.info("No new content loaded, stopping scroll")
-                    break
-                    
-                last_height = new_height
-                scroll_attempts += 1
-                
-            logger.info("Scroll complete, checking for listings...")
+            grow_wait = 5
+            # Worst case every scroll grows the page just before its wait runs out
+            self.driver.set_script_timeout(max_scroll_attempts * grow_wait + 5)
+            scrolls = self.driver.execute_async_script(
+                self.SCROLL_TO_END_JS, max_scroll_attempts, grow_wait * 1000, 250
+            )
+
+            logger.info(f"Scroll complete after {scrolls} page extensions, checking for listings...")
             return True
             
         except Exception as e:
             logger.error(f"Error during scrolling: {e}")
             return False
 
+    def find_listings_with(self, selector: str):
+        """Return elements matched by selector if they look like property listings"""
+        try:
+            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if elements and len(elements) > 2:  # Need at least a few elements
+                logger.info(f"✅ Found {len(elements)} listings with selector: {selector}")
+                
+                # Quick validation - check if elements contain property-like content
+                sample_element = elements[0]
+                sample_text = sample_element.text.lower() if sample_element.text else ""
+                
+                # Look for property indicators
+                if any(indicator in sample_text for indicator in self.PROPERTY_INDICATORS):
+                    logger.info(f"✅ Elements contain property data, using selector: {selector}")
+                    return elements
+                else:
+                    logger.debug(f"Elements don't contain property data: {sample_text[:100]}")
+                    
+        except Exception as e:
+            logger.debug(f"Selector {selector} failed: {e}")
+        return None
+
     def get_page_listings(self):
         """Get listings after triggering lazy loading"""
         try:
@@ -92,41 +194,19 @@ class CetiriZidaScraper(BaseScraper):
                 logger.warning("Failed to load content through scrolling")
                 return []
             
-            # Try multiple selectors for 4zida listings
-            possible_selectors = [
-                '[test-data="ad-search-card"]',      # Original
-                '[data-testid="ad-search-card"]',    # Alternative
-                '.search-results .card',             # Generic card
-                '.listing-card',                     # Generic listing
-                '.property-card',                    # Property card
-                'div[class*="card"]',                # Any div with "card"
-                'article',                           # Semantic article
-                '.ad-item',                          # Ad item
-                '[class*="listing"]',                # Any class with "listing"
-                '[class*="property"]'                # Any class with "property"
-            ]
-            
-            for selector in possible_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements and len(elements) > 2:  # Need at least a few elements
-                        logger.info(f"✅ Found {len(elements)} listings with selector: {selector}")
-                        
-                        # Quick validation - check if elements contain property-like content
-                        sample_element = elements[0]
-                        sample_text = sample_element.text.lower() if sample_element.text else ""
-                        
-                        # Look for property indicators
-                        property_indicators = ['€', 'din', 'eur', 'm²', 'm2', 'soban', 'stan', 'garsonjera']
-                        if any(indicator in sample_text for indicator in property_indicators):
-                            logger.info(f"✅ Elements contain property data, using selector: {selector}")
-                            return elements
-                        else:
-                            logger.debug(f"Elements don't contain property data: {sample_text[:100]}")
-                            
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
+            # The selector that worked on the previous page almost always works again
+            if self._winning_selector:
+                elements = self.find_listings_with(self._winning_selector)
+                if elements:
+                    # Workers get plain dicts, never WebElements
+                    return self.extract_cards(elements)
+                self._winning_selector = None
+
+            for selector in self.LISTING_SELECTORS:
+                elements = self.find_listings_with(selector)
+                if elements:
+                    self._winning_selector = selector
+                    return self.extract_cards(elements)
             
             # If no good selectors found, log debug info
             logger.warning("No listings found with any selector")
@@ -171,39 +251,6 @@ class CetiriZidaScraper(BaseScraper):
         except Exception as e:
             logger.error(f"Debug error: {e}")
         
-    def check_listing_exists(self, link: str, external_id: str) -> Tuple[bool, Optional[Listing]]:
-        if link in [pl.url for pl in self.processed_links]:
-            logger.debug(f"Found in memory: {link}")
-            return True, None
-
-        db = get_db_session()
-        try:
-            existing = db.query(Listing).filter(
-                or_(
-                    Listing.url == link,
-                    and_(
-                        Listing.source == '4zida.rs',
-                        Listing.external_id == external_id
-                    )
-                )
-            ).first()
-            
-            if existing:
-                logger.debug(f"Found in database: {link}")
-                return True, existing
-                
-            return False, None
-                
-        except Exception as e:
-            logger.error(f"Database check error: {e}")
-            return False, None
-        finally:
-            try:
-                db.close()
-                SessionFactory.remove()
-            except Exception as e:
-                logger.error(f"Error cleaning up database session: {e}")
-
     def extract_text_or_empty(self, element, selector, attribute=None):
         try:
             found = element.find_element(By.CSS_SELECTOR, selector)
@@ -217,111 +264,75 @@ class CetiriZidaScraper(BaseScraper):
     def parse_details(self, details_text: str) -> tuple:
         square_meters = 0
         rooms = ''
-        
-        if details_text:
-            details_parts = details_text.split('•')
-            for part in details_parts:
-                part = part.strip()
-                if 'm²' in part:
-                    try:
-                        square_meters = int(part.replace('m²', '').strip())
-                    except ValueError:
-                        pass
-                elif any(x in part.lower() for x in ['soban', 'garsonjera']):
-                    rooms = part
+
+        for match in _DETAILS_RE.finditer(details_text or ''):
+            if match['sqm']:
+                square_meters = parse_square_meters(match['sqm'])
+            else:
+                rooms = match['rooms']
 
         return square_meters, rooms
 
     def extract_price(self, price_text: str) -> float:
         try:
-            return float(''.join(filter(str.isdigit, price_text)))
-        except (ValueError, TypeError) as e:
+            digits = _PRICE_RE.findall(price_text)
+        except TypeError as e:
             logger.error(f"Price conversion error: {e}")
             return 0.0
+        return float(''.join(digits)) if digits else 0.0
 
-    def process_listing(self, listing, processed_links: Set[ProcessedLink]) -> bool:
-        db = get_db_session()
+    def extract_cards(self, listings) -> List[Dict[str, Optional[str]]]:
+        """Turn listing card elements into plain dicts with a single script call"""
+        return self.driver.execute_script(
+            self.EXTRACT_CARDS_JS,
+            listings,
+            self.CARD_TEXT_SELECTORS,
+            list(self.LINK_SELECTORS),
+            list(self.IMAGE_SELECTORS)
+        )
+
+    def listing_key(self, listing: Dict[str, Optional[str]]) -> Optional[Tuple[str, str]]:
+        if not listing['href']:
+            return None
+        link = self.normalize_url(listing['href'])
+        return link, link.split('/')[-1]
+
+    def process_listing(self, listing: Dict[str, Optional[str]], *, processed_links: Set[ProcessedLink]) -> bool:
+        """Process one card as returned by extract_cards()"""
         try:
             logger.debug("Processing listing...")
             
-            # Extract link with flexible selectors
-            link_elem = None
-            link_selectors = [
-                'a[href*="/izdavanje-stanova/"]',
-                'a[href*="4zida.rs"]',
-                'a[href*="/ad/"]',
-                'a[href]'
-            ]
-            
-            for selector in link_selectors:
-                try:
-                    link_elem = listing.find_element(By.CSS_SELECTOR, selector)
-                    break
-                except NoSuchElementException:
-                    continue
-                    
-            if not link_elem:
+            if not listing['href']:
                 logger.warning("No link found in listing")
                 return False
                 
-            link = self.normalize_url(link_elem.get_attribute('href'))
+            link = self.normalize_url(listing['href'])
             external_id = link.split('/')[-1] if link else 'unknown'
             
             logger.debug(f"Processing: {link}")
             
-            # Check duplicates
-            is_duplicate, existing = self.check_listing_exists(link, external_id)
-            if is_duplicate or link in [pl.url for pl in processed_links]:
-                LISTINGS_SKIPPED.inc()
+            # Check duplicates, the in-memory set first so known links never reach the database
+            if link in processed_links or self.check_listing_exists(link, external_id)[0]:
+                self._listings_skipped.inc()
                 logger.info(f"Skipping duplicate: {link}")
                 return True
 
-            # Extract data with flexible selectors
-            title = self.extract_listing_text(listing, [
-                'p.truncate.font-medium',
-                '.title',
-                'h3',
-                '[class*="title"]'
-            ]) or "Bez naslova"
-            
-            price_text = self.extract_listing_text(listing, [
-                'p.rounded-tl.bg-spotlight',
-                '.price',
-                '[class*="price"]'
-            ]) or "0"
-            
-            location = self.extract_listing_text(listing, [
-                'p.line-clamp-2',
-                '.location',
-                '[class*="location"]'
-            ]) or "Nepoznata lokacija"
-            
-            details = self.extract_listing_text(listing, [
-                'a.px-3.text-sm',
-                '.details',
-                '[class*="details"]'
-            ]) or ""
-            
-            info = self.extract_listing_text(listing, [
-                'div.flex-1.text-2xs',
-                '.info',
-                '.description'
-            ]) or ""
+            title = escape(listing['title'] or "Bez naslova")
+            price_text = escape(listing['price'] or "0")
+            location = escape(listing['location'] or "Nepoznata lokacija")
+            details = escape(listing['details'] or "")
+            info = escape(listing['info'] or "")
 
             price = self.extract_price(price_text)
             square_meters, rooms = self.parse_details(details)
 
             # Handle image
-            img_url = self.extract_image_url(listing)
+            img_url = listing['img']
             listing_photo = None
-            if img_url:
-                try:
-                    response = self.make_request(img_url)
-                    if response:
-                        listing_photo = BytesIO(response.content)
-                        listing_photo.name = 'image.jpg'
-                except Exception as e:
-                    logger.warning(f"Image error: {e}")
+            try:
+                listing_photo = self.fetch_listing_photo(img_url)
+            except Exception as e:
+                logger.warning(f"Image error: {e}")
 
             # Prepare data
             owner_data = {
@@ -363,115 +374,21 @@ class CetiriZidaScraper(BaseScraper):
             }]]
             }
 
-            # Send to Telegram
-            try:
-                if listing_photo:
-                    self.telegram.send_photo(listing_photo, caption, reply_markup=keyboard_markup)
-                else:
-                    self.telegram.send_message(caption, reply_markup=keyboard_markup)
-                logger.info(f"Sent to Telegram: {title}")
-            except Exception as e:
-                logger.error(f"Telegram failed: {e}")
+            # Send to Telegram, in the background
+            self.queue_telegram(listing_photo, caption, keyboard_markup)
 
             # Save to database
             self.save_listing(listing_data, owner_data)
             
             # Update processed links
-            processed_links.add(ProcessedLink(link))
-            self.save_processed_links(processed_links)
-            LISTINGS_PROCESSED.inc()
+            processed_link = ProcessedLink(link)
+            processed_links.add(processed_link)
+            self.append_processed_link(processed_link)
+            self._listings_processed.inc()
             logger.info(f"Successfully processed: {title}")
             return False
                 
         except Exception as e:
-            SCRAPING_ERRORS.inc()
+            self._scraping_errors.inc()
             logger.error(f"Processing error: {e}")
-            return False
-        finally:
-            try:
-                db.close()
-                SessionFactory.remove()
-            except Exception as e:
-                DB_CONNECTION_ERRORS.inc() 
-                logger.error(f"Error cleaning up database session: {e}")
-
-    def extract_listing_text(self, listing, selectors):
-        """Try multiple selectors to extract text"""
-        for selector in selectors:
-            try:
-                element = listing.find_element(By.CSS_SELECTOR, selector)
-                text = element.text.strip()
-                if text:
-                    return escape(text)
-            except:
-                continue
-        return None
-
-    def extract_image_url(self, listing):
-        """Extract image URL with multiple selectors"""
-        img_selectors = [
-            'img[alt*="4zida.rs"]',
-            'img[src*="4zida"]',
-            'img',
-            '.image img'
-        ]
-        
-        for selector in img_selectors:
-            try:
-                img = listing.find_element(By.CSS_SELECTOR, selector)
-                img_url = img.get_attribute('src')
-                if img_url:
-                    return img_url.split('#')[0]
-            except:
-                continue
-        return None
-    
-    def run(self):
-        processed_links = self.load_processed_links()
-        self.processed_links = processed_links
-        
-        while True:
-            try:
-                with self.setup_driver() as driver:
-                    self.driver = driver
-                    logger.info(f"Starting scan cycle for {self.__class__.__name__}")
-                    
-                    for page in range(1, 3):  # Test first 2 pages
-                        page_url = self.get_page_url(page)
-                        logger.info(f"Processing page {page}: {page_url}")
-                        
-                        try:
-                            self.driver.get(page_url)
-                            logger.info(f"Page loaded, starting content discovery...")
-                            
-                            listings = self.get_page_listings()
-                            if not listings:
-                                logger.warning(f"No listings found on page {page}")
-                                break
-                                
-                            logger.info(f"Found {len(listings)} listings on page {page}")
-                                
-                            # Process listings
-                            new_listings_count = 0
-                            for i, listing in enumerate(listings):
-                                logger.info(f"Processing listing {i+1}/{len(listings)}")
-                                try:
-                                    is_duplicate = self.process_listing(listing, self.processed_links)
-                                    if not is_duplicate:
-                                        new_listings_count += 1
-                                except Exception as e:
-                                    logger.error(f"Error processing listing {i+1}: {e}")
-                                    continue
-                                
-                            logger.info(f"Page {page}: {new_listings_count} new listings processed")
-                            
-                        except Exception as e:
-                            logger.error(f"Page {page} error: {e}")
-                            break
-
-                    logger.info(f"Cycle complete. Waiting {self.wait_time}s")
-                    time.sleep(self.wait_time)
-
-            except Exception as e:
-                logger.error(f"Critical error: {e}")
-                time.sleep(60)
\ No newline at end of file
+            return False
\ No newline at end of file
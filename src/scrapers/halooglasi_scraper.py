@@ -1,25 +1,43 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from io import BytesIO
+from selenium.common.exceptions import TimeoutException
 import requests
 import time
 from datetime import datetime
-from typing import Set
+from typing import Dict, List, Optional, Set, Tuple
 import logging
-from .base_scraper import BaseScraper, ProcessedLink, LISTINGS_PROCESSED, LISTINGS_SKIPPED, SCRAPING_ERRORS
+import re
+from .base_scraper import BaseScraper, ProcessedLink, parse_square_meters
 from utils.telegram import TelegramNotifier
-from database.session import get_db_session, SessionFactory
 from html import escape
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+import soupsieve as sv
 
 logger = logging.getLogger(__name__)
 
+_ROOMS_RE = re.compile(r'soban|garsonjera', re.IGNORECASE)
+_PRICE_RE = re.compile(r'\d+')
+
+# Card selectors are compiled once instead of on every card of every page
+_CARD_SEL = sv.compile('.product-item')
+_TITLE_SEL = sv.compile('h3.product-title a')
+_IMG_SEL = sv.compile('figure.pi-img-wrapper img')
+_PRICE_SEL = sv.compile('div.central-feature span')
+_PLACES_SEL = sv.compile('ul.subtitle-places li')
+_FEATURES_SEL = sv.compile('ul.product-features li .value-wrapper')
+_DESCRIPTION_SEL = sv.compile('p.text-description-list')
+_DATE_SEL = sv.compile('span.publish-date')
+_OWNER_SEL = sv.compile('span.basic-info')
+
 class HaloOglasiScraper(BaseScraper):
+    _source_name = 'halooglasi.rs'
+
     def __init__(self, bot_token: str, chat_id: str):
         super().__init__(
             bot_token=bot_token,
             chat_id=chat_id,
-            processed_links_path='data/processed_links/halo_links.json'
+            processed_links_path='data/processed_links/halo_links.jsonl'
         )
         self.telegram = TelegramNotifier(bot_token, chat_id)
         logger.info("HaloOglasiScraper initialized successfully")
@@ -34,7 +52,8 @@ class HaloOglasiScraper(BaseScraper):
             self.wait.until(EC.presence_of_element_located(
                 (By.CSS_SELECTOR, '.product-item')
             ))
-            listings = self.driver.find_elements(By.CSS_SELECTOR, '.product-item')
+            # Cards are read from one page_source snapshot; workers only ever see the dicts
+            listings = self.extract_cards()
             logger.info(f"Found {len(listings)} listings")
             return listings
         except TimeoutException:
@@ -44,89 +63,100 @@ class HaloOglasiScraper(BaseScraper):
             logger.error(f"Error finding listings: {e}")
             return []
 
-    def extract_text_or_empty(self, element, selector, attribute=None):
+    def extract_cards(self) -> List[Dict]:
+        """Parse every product card out of the current page source in one pass"""
+        page_url = self.driver.current_url
+        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+
+        def text(card, selector):
+            el = selector.select_one(card)
+            return el.get_text(' ', strip=True) if el else ''
+
+        cards = []
+        for card in _CARD_SEL.select(soup):
+            title_link = _TITLE_SEL.select_one(card)
+            img = _IMG_SEL.select_one(card)
+            cards.append({
+                'title': title_link.get_text(' ', strip=True) if title_link else '',
+                'href': urljoin(page_url, title_link['href']) if title_link and title_link.get('href') else None,
+                'price': text(card, _PRICE_SEL),
+                'locations': [
+                    li.get_text(' ', strip=True) for li in _PLACES_SEL.select(card)
+                    if li.get_text(strip=True)
+                ],
+                'features': [
+                    value.get_text(' ', strip=True)
+                    for value in _FEATURES_SEL.select(card)
+                ],
+                'description': text(card, _DESCRIPTION_SEL),
+                'date': text(card, _DATE_SEL),
+                'owner': text(card, _OWNER_SEL),
+                'img': urljoin(page_url, img['src']) if img and img.get('src') else None,
+            })
+        return cards
+
+    def listing_key(self, listing: Dict) -> Optional[Tuple[str, str]]:
+        if not listing['href']:
+            return None
+        link = self.normalize_url(listing['href'])
+        return link, link.split('/')[-1]
+
+    def process_listing(self, listing: Dict, *, processed_links: Set[ProcessedLink]) -> bool:
+        """Process one product card as returned by extract_cards()"""
         try:
-            found = element.find_element(By.CSS_SELECTOR, selector)
-            return found.get_attribute(attribute) if attribute else found.text.strip()
-        except NoSuchElementException:
-            return ""
-        except Exception as e:
-            logger.warning(f"Error extracting text: {e}")
-            return ""
+            if not listing['href']:
+                logger.warning("No link found in listing")
+                return False
 
-    def process_listing(self, listing, processed_links: Set[ProcessedLink]) -> bool:
-        db = get_db_session()
-        try:
-            # Extract title and link
-            title_elem = listing.find_element(By.CSS_SELECTOR, 'h3.product-title a')
-            title = escape(title_elem.text.strip())
-            link = self.normalize_url(title_elem.get_attribute('href'))
+            link = self.normalize_url(listing['href'])
             external_id = link.split('/')[-1] if link else 'unknown'
             
-            # Check duplicates
-            is_duplicate, existing = self.check_listing_exists(link, external_id)
-            if is_duplicate or link in [pl.url for pl in processed_links]:
-                LISTINGS_SKIPPED.inc()
+            # Check duplicates, the in-memory set first so known links never reach the database
+            if link in processed_links or self.check_listing_exists(link, external_id)[0]:
+                self._listings_skipped.inc()
                 logger.info(f"Skipping duplicate: {link}")
                 return True
 
+            title = escape(listing['title'])
+
             # Extract price
-            price_text = self.extract_text_or_empty(listing, 'div.central-feature span') or "Cena nije navedena"
+            price_text = listing['price'] or "Cena nije navedena"
             price_display = f"💰 {price_text}"
             
             # Parse price to float
-            try:
-                cleaned_price = ''.join(filter(str.isdigit, price_text))
-                price = float(cleaned_price) if cleaned_price else 0.0
-            except ValueError:
-                price = 0.0
+            price_digits = _PRICE_RE.findall(price_text)
+            price = float(''.join(price_digits)) if price_digits else 0.0
 
             # Extract location
-            locations = listing.find_elements(By.CSS_SELECTOR, 'ul.subtitle-places li')
-            location = ' » '.join([loc.text.strip() for loc in locations if loc.text.strip()])
+            location = ' » '.join(listing['locations'])
 
             # Extract features
-            features = listing.find_elements(By.CSS_SELECTOR, 'ul.product-features li')
-            feature_texts = []
+            feature_texts = listing['features']
             square_meters = 0
             rooms = ''
             
-            for feature in features:
-                try:
-                    value = feature.find_element(By.CSS_SELECTOR, '.value-wrapper').text
-                    feature_texts.append(value.replace('\n', ' '))
-                    
-                    # Parse square meters and rooms
-                    if 'm²' in value or 'm2' in value:
-                        try:
-                            square_meters = int(''.join(filter(str.isdigit, value)))
-                        except:
-                            pass
-                    elif any(x in value.lower() for x in ['soban', 'garsonjera', 'jednosoban', 'dvosoban']):
-                        rooms = value
-                except:
-                    continue
+            for value in feature_texts:
+                # Parse square meters and rooms
+                area = parse_square_meters(value)
+                if area:
+                    square_meters = area
+                elif _ROOMS_RE.search(value):
+                    rooms = value
                     
             features_text = ' • '.join(feature_texts)
 
             # Extract description
-            description = self.extract_text_or_empty(listing, 'p.text-description-list') or "Opis nije dostupan"
+            description = listing['description'] or "Opis nije dostupan"
 
             # Extract posting date and owner info
-            date_text = self.extract_text_or_empty(listing, 'span.publish-date')
-            owner_type = self.extract_text_or_empty(listing, 'span.basic-info')
+            date_text = listing['date']
+            owner_type = listing['owner']
 
             # Extract image
-            img_url = None
+            img_url = listing['img']
             listing_photo = None
             try:
-                img = listing.find_element(By.CSS_SELECTOR, 'figure.pi-img-wrapper img')
-                img_url = img.get_attribute('src')
-                if img_url and 'no-image' not in img_url:
-                    response = self.make_request(img_url)
-                    if response and response.ok:
-                        listing_photo = BytesIO(response.content)
-                        listing_photo.name = 'image.jpg'
+                listing_photo = self.fetch_listing_photo(img_url)
             except Exception as e:
                 logger.warning(f"Image error: {e}")
 
@@ -173,33 +203,21 @@ class HaloOglasiScraper(BaseScraper):
                 f"👤 {owner_type}"
             )
 
-            # Send to Telegram
-            try:
-                if listing_photo:
-                    self.telegram.send_photo(listing_photo, caption, reply_markup=keyboard_markup)
-                else:
-                    self.telegram.send_message(caption, reply_markup=keyboard_markup)
-                logger.info(f"Sent to Telegram: {title}")
-            except Exception as e:
-                logger.error(f"Telegram failed: {e}")
+            # Send to Telegram, in the background
+            self.queue_telegram(listing_photo, caption, keyboard_markup)
 
             # Save to database
             self.save_listing(listing_data, owner_data)
             
             # Update processed links
-            processed_links.add(ProcessedLink(link))
-            self.save_processed_links(processed_links)
-            LISTINGS_PROCESSED.inc()
+            processed_link = ProcessedLink(link)
+            processed_links.add(processed_link)
+            self.append_processed_link(processed_link)
+            self._listings_processed.inc()
             logger.info(f"Successfully processed: {title}")
             return False
                 
         except Exception as e:
-            SCRAPING_ERRORS.inc()
+            self._scraping_errors.inc()
             logger.error(f"Processing error: {e}")
-            return False
-        finally:
-            try:
-                db.close()
-                SessionFactory.remove()
-            except Exception as e:
-                logger.error(f"Error cleaning up database session: {e}")
\ No newline at end of file
+            return False
\ No newline at end of file
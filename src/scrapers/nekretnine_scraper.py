@@ -1,24 +1,70 @@
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
-from io import BytesIO
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import requests
-import time
 from datetime import datetime
-from typing import Set
+from typing import Dict, List, Optional, Set, Tuple
 import logging
-from .base_scraper import BaseScraper, ProcessedLink, LISTINGS_PROCESSED, LISTINGS_SKIPPED, SCRAPING_ERRORS
+import re
+from .base_scraper import BaseScraper, ProcessedLink, parse_square_meters
 from utils.telegram import TelegramNotifier
-from database.session import get_db_session, SessionFactory
 from html import escape
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+import soupsieve as sv
 
 logger = logging.getLogger(__name__)
 
+_DIGITS_RE = re.compile(r'\d+')
+
+# Offer row selectors for the plain-HTML path, compiled once instead of on every row of every page
+_ROW_SEL = sv.compile('.row.offer')
+_TITLE_SEL = sv.compile('.offer-title a')
+_IMG_SEL = sv.compile('.img-fluid')
+_PRICE_SEL = sv.compile('.offer-price span')
+_LOCATION_SEL = sv.compile('.offer-location')
+_META_SEL = sv.compile('.offer-meta-info')
+_METERS_SEL = sv.compile('.offer-price--invert span')
+
+# Room count keyword in the title -> stored rooms value, checked in this order
+_TITLE_ROOMS = {
+    'jednosoban': '1.0 soban',
+    'dvosoban': '2.0 soban',
+    'trosoban': '3.0 soban',
+    'četvorosoban': '4.0 soban',
+    'garsonjera': 'Garsonjera',
+}
+
 class NekretnineRSScraper(BaseScraper):
+    _source_name = 'nekretnine.rs'
+    # Paces list page and photo requests to the site across all workers
+    request_rate = 1.0
+    # Reads every offer row on the page in one WebDriver call; workers only ever see the dicts
+    EXTRACT_CARDS_JS = '''
+        const text = (card, selector) => {
+            const el = card.querySelector(selector);
+            return el ? el.innerText.trim() : '';
+        };
+        return arguments[0].map(card => {
+            const titleLink = card.querySelector('.offer-title a');
+            const img = card.querySelector('.img-fluid');
+            return {
+                title: titleLink ? titleLink.innerText.trim() : '',
+                href: titleLink ? titleLink.href : null,
+                price: text(card, '.offer-price span'),
+                location: text(card, '.offer-location'),
+                meta_info: text(card, '.offer-meta-info'),
+                meters: text(card, '.offer-price--invert span'),
+                img: img ? img.src : null
+            };
+        });
+    '''
+
     def __init__(self, bot_token: str, chat_id: str):
         super().__init__(
             bot_token=bot_token,
             chat_id=chat_id,
-            processed_links_path='data/processed_links/nekretnine_links.json'
+            processed_links_path='data/processed_links/nekretnine_links.jsonl'
         )
         self.telegram = TelegramNotifier(bot_token, chat_id)
         logger.info("NekretnineRSScraper initialized successfully")
@@ -30,95 +76,122 @@ class NekretnineRSScraper(BaseScraper):
 
     def get_page_listings(self):
         try:
+            self.wait.until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, '.row.offer')
+            ))
             listings = self.driver.find_elements(By.CSS_SELECTOR, ".row.offer")
             logger.info(f"Found {len(listings)} listings")
-            return listings
+            # Selenium isn't thread-safe, so rows are read here before workers get them
+            return self.extract_cards(listings)
+        except TimeoutException:
+            logger.warning("No listings found within timeout")
+            return []
         except Exception as e:
             logger.error(f"Error finding listings: {e}")
             return []
 
-    def extract_text_or_empty(self, element, selector, attribute=None):
-        try:
-            found = element.find_element(By.CSS_SELECTOR, selector)
-            return found.get_attribute(attribute) if attribute else found.text.strip()
-        except NoSuchElementException:
-            return ""
-        except Exception as e:
-            logger.warning(f"Error extracting text: {e}")
-            return ""
+    def load_page(self, page_url: str) -> Tuple[List[Dict[str, Optional[str]]], bool]:
+        """Read the list page over plain HTTP; Chrome is only started when that isn't enough"""
+        cards = self.fetch_cards(page_url)
+        if cards is None:
+            return super().load_page(page_url)
+        return cards, True
+
+    def fetch_cards(self, page_url: str) -> Optional[List[Dict[str, Optional[str]]]]:
+        """Read offer rows from the server-rendered list page without the browser
+
+        Returns None when the rows aren't in the plain HTML (blocked or JS-gated),
+        so the caller can fall back to Selenium.
+        """
+        response = self.make_request(page_url)
+        if response is None:
+            return None
+        soup = BeautifulSoup(response.content, 'html.parser')
+        rows = _ROW_SEL.select(soup)
+        if not rows:
+            logger.info(f"No offers in plain HTML, falling back to the browser: {page_url}")
+            return None
+
+        def text(row, selector):
+            el = selector.select_one(row)
+            return el.get_text(' ', strip=True) if el else ''
+
+        cards = []
+        for row in rows:
+            title_link = _TITLE_SEL.select_one(row)
+            img = _IMG_SEL.select_one(row)
+            cards.append({
+                'title': title_link.get_text(' ', strip=True) if title_link else '',
+                'href': urljoin(response.url, title_link['href']) if title_link and title_link.get('href') else None,
+                'price': text(row, _PRICE_SEL),
+                'location': text(row, _LOCATION_SEL),
+                'meta_info': text(row, _META_SEL),
+                'meters': text(row, _METERS_SEL),
+                'img': urljoin(response.url, img['src']) if img and img.get('src') else None,
+            })
+        return cards
+
+    def extract_cards(self, listings) -> List[Dict[str, Optional[str]]]:
+        """Turn offer row elements into plain dicts with a single script call"""
+        return self.driver.execute_script(self.EXTRACT_CARDS_JS, listings)
+
+    def listing_key(self, listing: Dict[str, Optional[str]]) -> Optional[Tuple[str, str]]:
+        if not listing['href']:
+            return None
+        link = self.normalize_url(listing['href'])
+        return link, link.split('/')[-1]
 
     def parse_price(self, price_text: str) -> float:
         try:
             # Extract numbers from price text
-            cleaned_price = ''.join(filter(str.isdigit, price_text))
-            return float(cleaned_price) if cleaned_price else 0.0
-        except (ValueError, TypeError):
+            return float(''.join(_DIGITS_RE.findall(price_text)) or 0)
+        except TypeError:
             return 0.0
 
     def extract_square_meters(self, details_text: str) -> int:
+        return parse_square_meters(details_text)
+
+    def process_listing(self, listing: Dict[str, Optional[str]], *, processed_links: Set[ProcessedLink]) -> bool:
+        """Process one offer row as returned by extract_cards()"""
         try:
-            if 'm²' in details_text or 'm2' in details_text:
-                numbers = ''.join(filter(str.isdigit, details_text))
-                return int(numbers) if numbers else 0
-        except:
-            pass
-        return 0
-
-    def process_listing(self, listing, processed_links: Set[ProcessedLink]) -> bool:
-        db = get_db_session()
-        try:
-            # Extract title and link
-            title_elem = listing.find_element(By.CSS_SELECTOR, '.offer-title a')
-            title = escape(title_elem.text.strip())
-            link = self.normalize_url(title_elem.get_attribute('href'))
+            if not listing['href']:
+                logger.warning("No link found in listing")
+                return False
+
+            link = self.normalize_url(listing['href'])
             external_id = link.split('/')[-1] if link else 'unknown'
             
-            # Check duplicates
-            is_duplicate, existing = self.check_listing_exists(link, external_id)
-            if is_duplicate or link in [pl.url for pl in processed_links]:
-                LISTINGS_SKIPPED.inc()
+            # Check duplicates, the in-memory set first so known links never reach the database
+            if link in processed_links or self.check_listing_exists(link, external_id)[0]:
+                self._listings_skipped.inc()
                 logger.info(f"Skipping duplicate: {link}")
                 return True
 
+            title = escape(listing['title'])
+
             # Extract price
-            price_text = self.extract_text_or_empty(listing, '.offer-price span') or "Cena nije navedena"
+            price_text = listing['price'] or "Cena nije navedena"
             price_display = f"💰 {price_text}"
             price = self.parse_price(price_text)
 
             # Extract location and meta info
-            location = self.extract_text_or_empty(listing, '.offer-location')
-            meta_info = self.extract_text_or_empty(listing, '.offer-meta-info')
+            location = listing['location']
+            meta_info = listing['meta_info']
 
             # Extract square meters
-            meters_text = self.extract_text_or_empty(listing, '.offer-price--invert span')
+            meters_text = listing['meters']
             square_meters = self.extract_square_meters(meters_text)
             details = f"Kvadratura: {meters_text}" if meters_text else ""
 
             # Try to extract rooms info from title or details
-            rooms = ''
-            if any(x in title.lower() for x in ['jednosoban', 'dvosoban', 'trosoban', 'četvorosoban', 'garsonjera']):
-                if 'jednosoban' in title.lower():
-                    rooms = '1.0 soban'
-                elif 'dvosoban' in title.lower():
-                    rooms = '2.0 soban'
-                elif 'trosoban' in title.lower():
-                    rooms = '3.0 soban'
-                elif 'četvorosoban' in title.lower():
-                    rooms = '4.0 soban'
-                elif 'garsonjera' in title.lower():
-                    rooms = 'Garsonjera'
+            title_lower = title.lower()
+            rooms = next((value for keyword, value in _TITLE_ROOMS.items() if keyword in title_lower), '')
 
             # Extract image
-            img_url = None
+            img_url = listing['img']
             listing_photo = None
             try:
-                img = listing.find_element(By.CSS_SELECTOR, '.img-fluid')
-                img_url = img.get_attribute('src')
-                if img_url:
-                    response = self.make_request(img_url)
-                    if response and response.ok:
-                        listing_photo = BytesIO(response.content)
-                        listing_photo.name = 'image.jpg'
+                listing_photo = self.fetch_listing_photo(img_url)
             except Exception as e:
                 logger.warning(f"Image error: {e}")
 
@@ -163,79 +236,21 @@ class NekretnineRSScraper(BaseScraper):
                 f"🏠 {details}"
             )
 
-            # Send to Telegram
-            try:
-                if listing_photo:
-                    self.telegram.send_photo(listing_photo, caption, reply_markup=keyboard_markup)
-                else:
-                    self.telegram.send_message(caption, reply_markup=keyboard_markup)
-                logger.info(f"Sent to Telegram: {title}")
-            except Exception as e:
-                logger.error(f"Telegram failed: {e}")
+            # Send to Telegram, in the background
+            self.queue_telegram(listing_photo, caption, keyboard_markup)
 
             # Save to database
             self.save_listing(listing_data, owner_data)
             
             # Update processed links
-            processed_links.add(ProcessedLink(link))
-            self.save_processed_links(processed_links)
-            LISTINGS_PROCESSED.inc()
+            processed_link = ProcessedLink(link)
+            processed_links.add(processed_link)
+            self.append_processed_link(processed_link)
+            self._listings_processed.inc()
             logger.info(f"Successfully processed: {title}")
             return False
                 
         except Exception as e:
-            SCRAPING_ERRORS.inc()
+            self._scraping_errors.inc()
             logger.error(f"Processing error: {e}")
-            return False
-        finally:
-            try:
-                db.close()
-                SessionFactory.remove()
-            except Exception as e:
-                logger.error(f"Error cleaning up database session: {e}")
-
-    def run(self):
-        processed_links = self.load_processed_links()
-        
-        while True:
-            try:
-                with self.setup_driver() as driver:
-                    self.driver = driver
-                    logger.info(f"Starting scan cycle for {self.__class__.__name__}")
-                    
-                    for page in range(1, 3):
-                        page_url = self.get_page_url(page)
-                        logger.info(f"Processing page {page}: {page_url}")
-                        
-                        try:
-                            self.driver.get(page_url)
-                            if not self.verify_page_loaded():
-                                break
-                            
-                            listings = self.get_page_listings()
-                            if not listings:
-                                break
-                                
-                            new_listings_count = 0
-                            for listing in listings:
-                                try:
-                                    is_duplicate = self.process_listing(listing, processed_links)
-                                    if not is_duplicate:
-                                        new_listings_count += 1
-                                    time.sleep(2)  # Rate limiting
-                                except Exception as e:
-                                    logger.error(f"Error processing listing: {e}")
-                                    continue
-                                
-                            logger.info(f"Page {page}: {new_listings_count} new listings processed")
-                            
-                        except Exception as e:
-                            logger.error(f"Page {page} error: {e}")
-                            break
-
-                    logger.info(f"Cycle complete. Waiting {self.wait_time}s")
-                    time.sleep(self.wait_time)
-
-            except Exception as e:
-                logger.error(f"Critical error: {e}")
-                time.sleep(60)
\ No newline at end of file
+            return False
\ No newline at end of file
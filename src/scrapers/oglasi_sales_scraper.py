@@ -1,35 +1,28 @@
-import certifi
-import requests
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
-from typing import Set
+from typing import Dict, Set
 import logging
 from datetime import datetime
-from io import BytesIO
+from pathlib import Path
 
-import urllib3
-
-from config.config import GOOGLE_SHEETS_CREDS, GOOGLE_SHEETS_ID
+from config import GOOGLE_SHEETS_CREDS, GOOGLE_SHEETS_ID
 from utils.sales_sheets_helper import SalesGoogleSheetsHelper
 from utils.sales_telegram import SalesTelegramNotifier
-from .oglasi_scraper import OglasiScraper, ProcessedLink, LISTINGS_PROCESSED, LISTINGS_SKIPPED, SCRAPING_ERRORS, DB_CONNECTION_ERRORS
+from .oglasi_scraper import OglasiScraper, ProcessedLink
 
 logger = logging.getLogger(__name__)
 
 class OglasiSalesScraper(OglasiScraper):
+    # Sales share the oglasi.rs source rows but get their own listings_total series
+    _metrics_label = 'oglasi.rs-sales'
+
     def __init__(self, bot_token: str, chat_id: str):
         super().__init__(
             bot_token=bot_token,
             chat_id=chat_id
         )
         # Override the processed_links_path to use a different file for sales
-        self.processed_links_path = 'data/processed_links/oglasi_sales_links.json'
+        self.processed_links_path = Path('data/processed_links/oglasi_sales_links.jsonl')
         self.telegram = SalesTelegramNotifier(bot_token, chat_id)
         self.sheets_helper = SalesGoogleSheetsHelper(GOOGLE_SHEETS_CREDS, GOOGLE_SHEETS_ID)
-        self.processed_links = set()
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        self.session = requests.Session()
-        self.session.verify = certifi.where()
         
     def get_page_url(self, page: int) -> str:
         """Override to use sales URLs instead of rentals"""
@@ -37,40 +30,24 @@ class OglasiSalesScraper(OglasiScraper):
             return "https://www.oglasi.rs/nekretnine/prodaja-stanova/novi-sad?s=d&rt=vlasnik"
         return f"https://www.oglasi.rs/nekretnine/prodaja-stanova/novi-sad?s=d&rt=vlasnik&p={page}"
 
-    def extract_building_condition(self, listing) -> str:
-        """Extract the condition of the building (stanje objekta)"""
-        try:
-            condition_element = listing.find_element(By.CSS_SELECTOR, 'div.col-sm-6:nth-of-type(3) strong')
-            return condition_element.text.strip()
-        except Exception as e:
-            logger.warning(f"Error extracting building condition: {e}")
-            return ""
-
-    def extract_floor_level(self, listing) -> str:
-        """Extract the floor level (nivo u zgradi)"""
+    def process_listing(self, listing: Dict, *, processed_links: Set[ProcessedLink]) -> bool:
+        """Process a sales listing card as returned by extract_cards()"""
         try:
-            level_element = listing.find_element(By.CSS_SELECTOR, 'div.col-sm-6:nth-of-type(4) strong')
-            return level_element.text.strip()
-        except Exception as e:
-            logger.warning(f"Error extracting floor level: {e}")
-            return ""
+            if not listing['href']:
+                logger.warning("No link found in listing")
+                return False
 
-    def process_listing(self, listing, processed_links: Set[ProcessedLink]) -> bool:
-        """Process a sales listing"""
-        db = self.get_db_session()
-        try:
-            title_elem = listing.find_element(By.CSS_SELECTOR, '.fpogl-list-title')
-            title = self.extract_text_or_empty(title_elem, 'h2')
-            link = self.normalize_url(title_elem.get_attribute('href'))
+            link = self.normalize_url(listing['href'])
             external_id = link.split('/')[-2]
 
-            # Check if we've already processed this listing
-            is_duplicate, existing = self.check_listing_exists(link, external_id)
-            if is_duplicate:
-                LISTINGS_SKIPPED.inc()
+            # Check duplicates, the in-memory set first so known links never reach the database
+            if link in processed_links or self.check_listing_exists(link, external_id)[0]:
+                self._listings_skipped.inc()
                 logger.info(f"Skipping duplicate: {link}")
                 return True
 
+            title = listing['title']
+
             # Extract the same data as for rentals
             price_text = self.extract_price(listing)
             price_display = f"💰 {price_text}"
@@ -88,61 +65,33 @@ class OglasiSalesScraper(OglasiScraper):
                 price = 0.0
 
             # Extract general details
-            details = []
-            detail_elements = listing.find_elements(By.CSS_SELECTOR, '.row .col-sm-6 strong')
-            for detail in detail_elements:
-                if detail.text.strip():
-                    details.append(detail.text.strip())
+            details = listing['details']
 
-            # Extract specific details for sales listings
-            building_condition = self.extract_building_condition(listing)
-            floor_level = self.extract_floor_level(listing)
+            # Specific details for sales listings: stanje objekta and nivo u zgradi
+            building_condition = listing['building_condition']
+            floor_level = listing['floor_level']
 
             # Extract common details
-            square_meters = 0
-            rooms = ''
-            for detail in details:
-                if 'm2' in detail:
-                    try:
-                        square_meters = int(detail.replace('m2', '').strip())
-                    except:
-                        pass
-                if 'soban' in detail or 'garsonjera' in detail:
-                    rooms = detail
-
-            location = self.extract_location_from_breadcrumbs(listing)
-            description = self.extract_text_or_empty(listing, 'p[itemprop="description"]')
+            square_meters, rooms = self.parse_details(details)
+
+            location = listing['location']
+            description = listing['description']
             posted_date = self.extract_posting_date(listing, visit_detail=False)
 
             # Extract image
             img_url = None
             listing_photo = None
             try:
-                img_selectors = [
-                    'img[itemprop="image"]',
-                    'img.img-responsive',
-                    '.carousel-item img',
-                    '.listing-image img'
-                ]
-                
-                for selector in img_selectors:
-                    try:
-                        img = listing.find_element(By.CSS_SELECTOR, selector)
-                        img_url = img.get_attribute('src')
-                        if img_url and 'no-image' not in img_url:
-                            response = self.session.get(img_url, verify=certifi.where())
-                            if response.ok:
-                                listing_photo = BytesIO(response.content)
-                                listing_photo.name = 'image.jpg'
-                                break
-                    except NoSuchElementException:
-                        continue
+                for img_url in listing['images']:
+                    listing_photo = self.fetch_listing_photo(img_url)
+                    if listing_photo:
+                        break
             except Exception as e:
                 logger.warning(f"Image error: {e}")
 
             # Create owner data
             owner_data = {
-                'name': self.extract_text_or_empty(listing, 'cite') or "Unknown",
+                'name': listing['owner'] or "Unknown",
                 'phone': '',
                 'source': 'oglasi.rs',
                 'external_id': external_id
@@ -189,34 +138,21 @@ class OglasiSalesScraper(OglasiScraper):
                 f"⏰ Objavljeno: {posted_date.strftime('%d.%m.%Y.')}"
             )
 
-            # Send to Telegram
-            try:
-                if listing_photo:
-                    self.telegram.send_photo(listing_photo, caption, reply_markup=keyboard_markup)
-                else:
-                    self.telegram.send_message(caption, reply_markup=keyboard_markup)
-            except Exception as e:
-                logger.error(f"Telegram failed: {e}")
+            # Send to Telegram, in the background
+            self.queue_telegram(listing_photo, caption, keyboard_markup)
 
             # Save to database
             self.save_listing(listing_data, owner_data)
             
             # Mark as processed
-            processed_links.add(ProcessedLink(link))
-            self.save_processed_links(processed_links)
+            processed_link = ProcessedLink(link)
+            processed_links.add(processed_link)
+            self.append_processed_link(processed_link)
             
-            LISTINGS_PROCESSED.inc()
+            self._listings_processed.inc()
             return False
 
         except Exception as e:
-            SCRAPING_ERRORS.inc()
+            self._scraping_errors.inc()
             logger.error(f"Processing error: {e}")
-            return False
-        finally:
-            try:
-                db.close()
-                from database.session import SessionFactory
-                SessionFactory.remove()
-            except Exception as e:
-                DB_CONNECTION_ERRORS.inc()
-                logger.error(f"Error cleaning up database session: {e}")
\ No newline at end of file
+            return False
\ No newline at end of file
@@ -1,25 +1,43 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from io import BytesIO
+from selenium.common.exceptions import TimeoutException
 import requests
-import time
 from datetime import datetime
-from typing import Set
+from typing import Dict, List, Optional, Set, Tuple
 import logging
-from .base_scraper import BaseScraper, ProcessedLink, LISTINGS_PROCESSED, LISTINGS_SKIPPED, SCRAPING_ERRORS
+import re
+from .base_scraper import BaseScraper, ProcessedLink, parse_square_meters
 from utils.telegram import TelegramNotifier
-from database.session import get_db_session, SessionFactory
 from html import escape
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+import soupsieve as sv
 
 logger = logging.getLogger(__name__)
 
+_DIGITS_RE = re.compile(r'\d+')
+_ROOMS_RE = re.compile(r'soban|garsonjera', re.IGNORECASE)
+
+# Card selectors are compiled once instead of on every card of every page
+_CARD_SEL = sv.compile('.product-single-item')
+_LINK_SEL = sv.compile('a.product-link')
+_TITLE_SEL = sv.compile('.product-title')
+_IMG_SEL = sv.compile('picture img')
+_PRICE_SEL = sv.compile('.product-price')
+_LOCATION_SEL = sv.compile('.pin-item')
+_ATTRIBUTES_SEL = sv.compile('.highlighted-attributes li')
+_NEXT_SEL = sv.compile('.pagination a[rel="next"]')
+
 class SasoMangeScraper(BaseScraper):
+    _source_name = 'sasomange.rs'
+    # Replaces the old 2s sleep per listing; photo downloads now overlap on the worker pool
+    request_rate = 0.5
+
     def __init__(self, bot_token: str, chat_id: str):
         super().__init__(
             bot_token=bot_token,
             chat_id=chat_id,
-            processed_links_path='data/processed_links/sasomange_links.json'
+            processed_links_path='data/processed_links/sasomange_links.jsonl'
         )
         self.telegram = TelegramNotifier(bot_token, chat_id)
         logger.info("SasoMangeScraper initialized successfully")
@@ -44,98 +62,126 @@ class SasoMangeScraper(BaseScraper):
             logger.error(f"Error finding listings: {e}")
             return []
 
-    def extract_text_or_empty(self, element, selector, attribute=None):
-        try:
-            found = element.find_element(By.CSS_SELECTOR, selector)
-            return found.get_attribute(attribute) if attribute else found.text.strip()
-        except NoSuchElementException:
-            return ""
-        except Exception as e:
-            logger.warning(f"Error extracting text: {e}")
-            return ""
+    def parse_page(self, html, page_url: str) -> Tuple[List[Dict], bool]:
+        """Parse the product cards of a list page, and whether it links to a next page"""
+        soup = BeautifulSoup(html, 'html.parser')
+
+        def text(card, selector):
+            el = selector.select_one(card)
+            return el.get_text(' ', strip=True) if el else ''
+
+        cards = []
+        for card in _CARD_SEL.select(soup):
+            link = _LINK_SEL.select_one(card)
+            title = _TITLE_SEL.select_one(card)
+            img = _IMG_SEL.select_one(card)
+            cards.append({
+                'href': urljoin(page_url, link['href']) if link and link.get('href') else None,
+                'title': (title.get('data-name') or title.get_text(' ', strip=True)) if title else '',
+                'price': text(card, _PRICE_SEL),
+                'location': text(card, _LOCATION_SEL),
+                'attributes': [
+                    li.get_text(' ', strip=True) for li in _ATTRIBUTES_SEL.select(card)
+                    if li.get_text(strip=True)
+                ],
+                'img': urljoin(page_url, img['src']) if img and img.get('src') else None,
+            })
+        return cards, _NEXT_SEL.select_one(soup) is not None
+
+    def fetch_cards(self, page_url: str) -> Optional[Tuple[List[Dict], bool]]:
+        """Read a list page over plain HTTP; None when the cards need the browser to render"""
+        response = self.make_request(page_url)
+        if response is None:
+            return None
+        cards, has_next = self.parse_page(response.content, response.url)
+        if not cards:
+            logger.info(f"No products in plain HTML, falling back to the browser: {page_url}")
+            return None
+        return cards, has_next
+
+    def load_page(self, page_url: str) -> Tuple[List[Dict], bool]:
+        """Read the list page over plain HTTP; Chrome is only started when the cards need rendering"""
+        page_data = self.fetch_cards(page_url)
+        if page_data is not None:
+            return page_data
+
+        self.ensure_driver()
+        self.driver.get(page_url)
+        if not self.verify_page_loaded() or not self.get_page_listings():
+            return [], False
+        # One page_source parse; per-listing work never goes through chromedriver
+        return self.extract_cards()
+
+    def extract_cards(self) -> Tuple[List[Dict], bool]:
+        """Parse the page the browser is on from one page_source snapshot"""
+        return self.parse_page(self.driver.page_source, self.driver.current_url)
+
+    def listing_key(self, listing: Dict) -> Optional[Tuple[str, str]]:
+        if not listing['href']:
+            return None
+        link = self.normalize_url(listing['href'])
+        return link, link.split('/')[-1]
 
     def parse_price(self, price_text: str) -> float:
         try:
-            # Extract numbers from price text, handle EUR currency
-            if "EUR" in price_text.upper() or "€" in price_text:
-                cleaned_price = ''.join(filter(str.isdigit, price_text))
-                return float(cleaned_price) if cleaned_price else 0.0
-            else:
-                cleaned_price = ''.join(filter(str.isdigit, price_text))
-                return float(cleaned_price) if cleaned_price else 0.0
-        except (ValueError, TypeError):
+            # Digits only, whatever the currency; "." and spaces are thousands separators here
+            return float(''.join(_DIGITS_RE.findall(price_text)) or 0)
+        except TypeError:
             return 0.0
 
-    def extract_attributes_data(self, listing) -> tuple:
+    def extract_attributes_data(self, attributes: List[str]) -> tuple:
         """Extract square meters and rooms from attributes"""
         square_meters = 0
         rooms = ''
         
         try:
-            attrs = listing.find_elements(By.CSS_SELECTOR, '.highlighted-attributes li')
-            for attr in attrs:
-                attr_text = attr.text
-                if 'm²' in attr_text or 'm2' in attr_text:
-                    try:
-                        square_meters = int(''.join(filter(str.isdigit, attr_text)))
-                    except:
-                        pass
-                elif any(x in attr_text.lower() for x in ['soban', 'garsonjera']):
+            for attr_text in attributes:
+                area = parse_square_meters(attr_text)
+                if area:
+                    square_meters = area
+                elif _ROOMS_RE.search(attr_text):
                     rooms = attr_text
         except Exception as e:
             logger.warning(f"Error extracting attributes: {e}")
             
         return square_meters, rooms
 
-    def process_listing(self, listing, processed_links: Set[ProcessedLink]) -> bool:
-        db = get_db_session()
+    def process_listing(self, listing: Dict, *, processed_links: Set[ProcessedLink]) -> bool:
+        """Process one product card as returned by extract_cards()"""
         try:
-            # Extract title using data attribute
-            title_elem = listing.find_element(By.CSS_SELECTOR, '.product-title')
-            title = escape(title_elem.get_attribute('data-name') or title_elem.text.strip())
-            
-            # Extract link
-            link_elem = listing.find_element(By.CSS_SELECTOR, 'a.product-link')
-            link = self.normalize_url(link_elem.get_attribute('href'))
+            if not listing['href']:
+                logger.warning("No link found in listing")
+                return False
+
+            link = self.normalize_url(listing['href'])
             external_id = link.split('/')[-1] if link else 'unknown'
             
-            # Check duplicates
-            is_duplicate, existing = self.check_listing_exists(link, external_id)
-            if is_duplicate or link in [pl.url for pl in processed_links]:
-                LISTINGS_SKIPPED.inc()
+            # Check duplicates, the in-memory set first so known links never reach the database
+            if link in processed_links or self.check_listing_exists(link, external_id)[0]:
+                self._listings_skipped.inc()
                 logger.info(f"Skipping duplicate: {link}")
                 return True
 
+            # Title comes from the card's data-name attribute when present
+            title = escape(listing['title'])
+
             # Extract price
-            price_text = self.extract_text_or_empty(listing, '.product-price') or "Cena nije navedena"
+            price_text = listing['price'] or "Cena nije navedena"
             price_display = f"💰 {price_text}"
             price = self.parse_price(price_text)
 
             # Extract location
-            location = self.extract_text_or_empty(listing, '.pin-item')
+            location = listing['location']
 
-            # Extract attributes and parse square meters/rooms
-            square_meters, rooms = self.extract_attributes_data(listing)
-            
-            # Get all attributes for display
-            attributes = []
-            try:
-                attrs = listing.find_elements(By.CSS_SELECTOR, '.highlighted-attributes li')
-                attributes = [attr.text for attr in attrs if attr.text.strip()]
-            except:
-                pass
+            # Attributes for display, and square meters/rooms parsed from them
+            attributes = listing['attributes']
+            square_meters, rooms = self.extract_attributes_data(attributes)
 
             # Extract image
-            img_url = None
+            img_url = listing['img']
             listing_photo = None
             try:
-                img = listing.find_element(By.CSS_SELECTOR, 'picture img')
-                img_url = img.get_attribute('src')
-                if img_url:
-                    response = self.make_request(img_url)
-                    if response and response.ok:
-                        listing_photo = BytesIO(response.content)
-                        listing_photo.name = 'image.jpg'
+                listing_photo = self.fetch_listing_photo(img_url)
             except Exception as e:
                 logger.warning(f"Image error: {e}")
 
@@ -179,89 +225,21 @@ class SasoMangeScraper(BaseScraper):
                 f"🏠 {' • '.join(attributes)}"
             )
 
-            # Send to Telegram
-            try:
-                if listing_photo:
-                    self.telegram.send_photo(listing_photo, caption, reply_markup=keyboard_markup)
-                else:
-                    self.telegram.send_message(caption, reply_markup=keyboard_markup)
-                logger.info(f"Sent to Telegram: {title}")
-            except Exception as e:
-                logger.error(f"Telegram failed: {e}")
+            # Send to Telegram, in the background
+            self.queue_telegram(listing_photo, caption, keyboard_markup)
 
             # Save to database
             self.save_listing(listing_data, owner_data)
             
             # Update processed links
-            processed_links.add(ProcessedLink(link))
-            self.save_processed_links(processed_links)
-            LISTINGS_PROCESSED.inc()
+            processed_link = ProcessedLink(link)
+            processed_links.add(processed_link)
+            self.append_processed_link(processed_link)
+            self._listings_processed.inc()
             logger.info(f"Successfully processed: {title}")
             return False
                 
         except Exception as e:
-            SCRAPING_ERRORS.inc()
+            self._scraping_errors.inc()
             logger.error(f"Processing error: {e}")
-            return False
-        finally:
-            try:
-                db.close()
-                SessionFactory.remove()
-            except Exception as e:
-                logger.error(f"Error cleaning up database session: {e}")
-
-    def run(self):
-        processed_links = self.load_processed_links()
-        
-        while True:
-            try:
-                with self.setup_driver() as driver:
-                    self.driver = driver
-                    logger.info(f"Starting scan cycle for {self.__class__.__name__}")
-                    
-                    for page in range(1, 3):
-                        page_url = self.get_page_url(page)
-                        logger.info(f"Processing page {page}: {page_url}")
-                        
-                        try:
-                            self.driver.get(page_url)
-                            if not self.verify_page_loaded():
-                                break
-                            
-                            listings = self.get_page_listings()
-                            if not listings:
-                                break
-                                
-                            new_listings_count = 0
-                            for listing in listings:
-                                try:
-                                    is_duplicate = self.process_listing(listing, processed_links)
-                                    if not is_duplicate:
-                                        new_listings_count += 1
-                                    time.sleep(2)  # Rate limiting
-                                except Exception as e:
-                                    logger.error(f"Error processing listing: {e}")
-                                    continue
-                                
-                            logger.info(f"Page {page}: {new_listings_count} new listings processed")
-                            
-                            # Check for next page
-                            try:
-                                next_button = self.driver.find_element(By.CSS_SELECTOR, '.pagination a[rel="next"]')
-                                if not next_button:
-                                    logger.info("No more pages available")
-                                    break
-                            except:
-                                logger.info("No more pages available")
-                                break
-                            
-                        except Exception as e:
-                            logger.error(f"Page {page} error: {e}")
-                            break
-
-                    logger.info(f"Cycle complete. Waiting {self.wait_time}s")
-                    time.sleep(self.wait_time)
-
-            except Exception as e:
-                logger.error(f"Critical error: {e}")
-                time.sleep(60)
\ No newline at end of file
+            return False
\ No newline at end of file
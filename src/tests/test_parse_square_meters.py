@@ -0,0 +1,22 @@
+import unittest
+
+from utils.parsing import parse_square_meters
+
+
+class ParseSquareMetersTest(unittest.TestCase):
+    def test_whole_number(self):
+        self.assertEqual(parse_square_meters('55 m²'), 55)
+
+    def test_decimal_comma(self):
+        self.assertEqual(parse_square_meters('55,5 m2'), 55)
+
+    def test_thousands_separator(self):
+        self.assertEqual(parse_square_meters('1.200 m2'), 1200)
+
+    def test_no_area(self):
+        self.assertEqual(parse_square_meters('Trosoban stan'), 0)
+        self.assertEqual(parse_square_meters(None), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,20 @@
 # src/utils/__init__.py
-from .telegram import TelegramNotifier
-from .sales_telegram import SalesTelegramNotifier
-from .sheets_helper import GoogleSheetsHelper
-from . sales_sheets_helper import SalesGoogleSheetsHelper
\ No newline at end of file
+import importlib
+
+# Helpers are imported on first access so that importing one utils module
+# (e.g. utils.parsing) doesn't pull in the Telegram and Google client stacks
+_HELPER_MODULES = {
+    'TelegramNotifier': 'telegram',
+    'SalesTelegramNotifier': 'sales_telegram',
+    'GoogleSheetsHelper': 'sheets_helper',
+    'SalesGoogleSheetsHelper': 'sales_sheets_helper',
+}
+
+
+def __getattr__(name):
+    module_name = _HELPER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    helper = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = helper
+    return helper
\ No newline at end of file
@@ -0,0 +1,12 @@
+import re
+from typing import Optional
+
+# Floor area like "55 m²", "55,5 m2" or "1.200 m2": "." groups thousands, "," is the decimal mark;
+# the lookbehind keeps "m2" and the tail of a longer number from being read as the area
+_AREA_RE = re.compile(r'(?<![\d.,])(\d{1,3}(?:\.\d{3})+|\d+)(?:[.,]\d+)?\s*m[²2]')
+
+
+def parse_square_meters(text: Optional[str]) -> int:
+    """Whole square metres of the first area in text, or 0 if it has none"""
+    match = _AREA_RE.search(text or '')
+    return int(match.group(1).replace('.', '')) if match else 0
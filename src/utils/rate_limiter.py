@@ -0,0 +1,38 @@
+import random
+import threading
+import time
+
+
+def backoff_delay(previous: float, base: float = 1.0, cap: float = 60.0) -> float:
+    """Decorrelated-jitter backoff: a random wait between `base` and three times the previous one"""
+    return min(cap, random.uniform(base, previous * 3))
+
+
+class RateLimiter:
+    """Token bucket shared by threads: `rate` acquisitions per second, bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            # Going negative reserves a slot, so concurrent callers queue up in order
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+    def penalize(self, seconds: float) -> None:
+        """Empty the bucket so every caller, not just the one that got throttled, waits `seconds` more"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
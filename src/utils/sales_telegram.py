@@ -1,31 +1,37 @@
 from io import BytesIO
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from utils.telegram import TelegramNotifier
 
 
 class SalesTelegramNotifier(TelegramNotifier):
+    # Rental caption opening and the sales marker that replaces it
+    RENTAL_PREFIX = "<b>📋"
+    SALES_PREFIX = "<b>🏡 PRODAJA:"
+
     def __init__(self, bot_token: str, chat_id: str):
         super().__init__(bot_token, chat_id)
+
+    def _sales_caption(self, text: str) -> str:
+        """Swap a leading rental marker for the PRODAJA prefix; only the prefix is touched"""
+        if text.startswith(self.RENTAL_PREFIX):
+            return self.SALES_PREFIX + text[len(self.RENTAL_PREFIX):]
+        return text
     
     def send_photo(self, 
                   photo: BytesIO, 
                   caption: str, 
                   reply_markup: Optional[Dict] = None) -> Dict:
         """Send photo with sales-specific formatting"""
-        # Customize caption for sales listings
-        if caption.startswith("<b>📋"):
-            # Replace the emoji and add "PRODAJA" prefix
-            caption = caption.replace("<b>📋", "<b>🏡 PRODAJA:")
-        
-        return super().send_photo(photo, caption, reply_markup)
+        return super().send_photo(photo, self._sales_caption(caption), reply_markup)
+
+    def send_media_group(self, photos: List[Tuple[BytesIO, str]]) -> Dict:
+        """Send an album with sales-specific captions"""
+        return super().send_media_group([
+            (photo, self._sales_caption(caption)) for photo, caption in photos
+        ])
 
     def send_message(self, 
                     text: str, 
                     reply_markup: Optional[Dict] = None) -> Dict:
         """Send text message with sales-specific formatting"""
-        # Customize text for sales listings
-        if text.startswith("<b>📋"):
-            # Replace the emoji and add "PRODAJA" prefix
-            text = text.replace("<b>📋", "<b>🏡 PRODAJA:")
-        
-        return super().send_message(text, reply_markup)
\ No newline at end of file
+        return super().send_message(self._sales_caption(text), reply_markup)
\ No newline at end of file
@@ -1,14 +1,27 @@
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 import logging
 from datetime import datetime
 import time
 from typing import List, Dict, Any, Optional
+from utils.rate_limiter import RateLimiter, backoff_delay
 
 logger = logging.getLogger(__name__)
 
+# Every helper in the process writes under the same account's quota of 60 write requests a minute
+_WRITE_LIMITER = RateLimiter(60 / 60.0, burst=60)
+
 class GoogleSheetsHelper:
+    # Target tab and columns for appended rows
+    sheet_range = 'Listings!A:J'
+    # Layout of the timestamp and posted date columns
+    DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+    # Socket timeout for Sheets calls; httplib2's default is to wait forever
+    http_timeout = 30
+
     def __init__(self, credentials_path: str, spreadsheet_id: str):
         """
         Initialize Google Sheets helper with credentials and spreadsheet ID.
@@ -27,8 +40,14 @@ class GoogleSheetsHelper:
                 scopes=self.scope
             )
             
-            # Build service
-            self.service = build('sheets', 'v4', credentials=self.creds)
+            # Build service from the discovery document bundled with the client library,
+            # over one keep-alive connection with a timeout
+            self.service = build(
+                'sheets', 'v4',
+                http=AuthorizedHttp(self.creds, http=httplib2.Http(timeout=self.http_timeout)),
+                static_discovery=True,
+                cache_discovery=False
+            )
             logger.info("Google Sheets service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Google Sheets: {e}")
@@ -45,8 +64,9 @@ class GoogleSheetsHelper:
             list: Formatted row of data
         """
         try:
+            now = datetime.now()
             return [
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                now.strftime(self.DATE_FORMAT),
                 str(listing_data.get('source', '')),
                 str(listing_data.get('title', '')),
                 f"{float(listing_data.get('price', 0)):.2f}",
@@ -55,7 +75,7 @@ class GoogleSheetsHelper:
                 str(listing_data.get('location', '')),
                 str(listing_data.get('url', '')),
                 str(listing_data.get('description', '')),  # Optional description
-                str(listing_data.get('posted_date', datetime.now()).strftime("%Y-%m-%d %H:%M:%S"))  # Posted date
+                (listing_data.get('posted_date') or now).strftime(self.DATE_FORMAT)  # Posted date
             ]
         except Exception as e:
             logger.error(f"Error formatting row: {e}")
@@ -72,46 +92,66 @@ class GoogleSheetsHelper:
         Returns:
             bool: True if successful, False otherwise
         """
+        return self.append_listings_batch([listing_data], max_retries)
+
+    def append_listings_batch(self, listings_data: List[Dict[str, Any]], max_retries: int = 3) -> bool:
+        """
+        Append several listings to the Google Sheet with a single API call.
+        
+        Args:
+            listings_data (list): Dictionaries containing listing information
+            max_retries (int): Maximum number of retry attempts
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        # Format the row data
+        rows = [row for row in map(self.format_row, listings_data) if row]
+        if not rows:
+            return False
+
+        body = {
+            'values': rows,
+            'majorDimension': 'ROWS'
+        }
+        delay = 1.0
+
         for attempt in range(max_retries):
             try:
-                # Format the row data
-                row = self.format_row(listing_data)
-                if not row:
-                    return False
-
-                body = {
-                    'values': [row],
-                    'majorDimension': 'ROWS'
-                }
-                
+                _WRITE_LIMITER.acquire()
                 # Execute the append request
-                result = self.service.spreadsheets().values().append(
+                self.service.spreadsheets().values().append(
                     spreadsheetId=self.spreadsheet_id,
-                    range='Listings!A:J',  # Updated to include description and posted_date
+                    range=self.sheet_range,
                     valueInputOption='USER_ENTERED',
                     insertDataOption='INSERT_ROWS',
                     body=body
                 ).execute()
                 
-                logger.info(f"Successfully appended listing: {listing_data.get('url', '')}")
+                logger.info(f"Successfully appended {len(rows)} listing(s) to {self.sheet_range}")
                 return True
                 
             except HttpError as e:
                 if e.resp.status in [429, 500, 503]:  # Rate limit or server error
                     if attempt < max_retries - 1:
-                        delay = min(2 ** attempt, 60)  # Exponential backoff, max 60 seconds
-                        logger.warning(f"Sheets API error {e.resp.status}, retrying in {delay}s")
-                        time.sleep(delay)
+                        delay = backoff_delay(delay)  # Jittered exponential backoff, max 60 seconds
+                        logger.warning(f"Sheets API error {e.resp.status}, retrying in {delay:.1f}s")
+                        if e.resp.status == 429:
+                            # Over quota: hold back every writer, the next acquire() waits it out
+                            _WRITE_LIMITER.penalize(delay)
+                        else:
+                            time.sleep(delay)
                         continue
                 logger.error(f"Sheets API error: {e}")
                 return False
                 
             except Exception as e:
                 if attempt < max_retries - 1:
-                    logger.warning(f"Error appending listing, attempt {attempt + 1} of {max_retries}: {e}")
-                    time.sleep(2 ** attempt)
+                    logger.warning(f"Error appending listings, attempt {attempt + 1} of {max_retries}: {e}")
+                    delay = backoff_delay(delay)
+                    time.sleep(delay)
                     continue
-                logger.error(f"Failed to append listing to sheets: {e}")
+                logger.error(f"Failed to append listings to sheets: {e}")
                 return False
         
         return False
@@ -135,17 +175,23 @@ class GoogleSheetsHelper:
             logger.error(f"Failed to clear sheet: {e}")
             return False
 
-    def get_all_listings(self) -> Optional[List[List[str]]]:
+    def get_all_listings(self, start_row: int = 1) -> Optional[List[List[str]]]:
         """
         Get all listings from the sheet.
         
+        Args:
+            start_row (int): First sheet row to read, for reading only rows added since a previous call
+            
         Returns:
             Optional[List[List[str]]]: List of rows or None if failed
         """
+        tab, columns = self.sheet_range.split('!')
+        first_column, last_column = columns.split(':')
         try:
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=self.spreadsheet_id,
-                range='Listings!A:J'
+                range=f'{tab}!{first_column}{start_row}:{last_column}',
+                fields='values'  # Only the cells, not the range/majorDimension envelope
             ).execute()
             return result.get('values', [])
         except Exception as e:
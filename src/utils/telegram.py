@@ -1,9 +1,10 @@
 from io import BytesIO
 import requests
-import json
+import orjson
 import time
 import logging
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+from utils.rate_limiter import backoff_delay
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,12 @@ class TelegramNotifier:
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
         self.max_retries = 3
         self.timeout = 30
+        # Keep-alive to api.telegram.org instead of a new TLS handshake per message
+        self.session = requests.Session()
+
+    def close(self):
+        """Close the pooled connections to the Bot API"""
+        self.session.close()
 
     def _make_request(self, 
                      endpoint: str, 
@@ -21,21 +28,23 @@ class TelegramNotifier:
                      files: Optional[Dict] = None) -> Dict:
         """Make request to Telegram API with retry logic"""
         url = f"{self.base_url}/{endpoint}"
+        delay = 1.0
 
         for attempt in range(self.max_retries):
             try:
                 if files:
-                    response = requests.post(url, 
+                    response = self.session.post(url, 
                                           data=payload, 
                                           files=files, 
                                           timeout=self.timeout)
                 else:
-                    response = requests.post(url, 
-                                          json=payload, 
+                    response = self.session.post(url, 
+                                          data=orjson.dumps(payload), 
+                                          headers={'Content-Type': 'application/json'},
                                           timeout=self.timeout)
                 
                 response.raise_for_status()
-                return response.json()
+                return orjson.loads(response.content)
 
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 429:  # Too many requests
@@ -49,7 +58,9 @@ class TelegramNotifier:
             except Exception as e:
                 logger.error(f"Error during {endpoint}: {e}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    # Jittered backoff, so senders that failed together don't retry together
+                    delay = backoff_delay(delay)
+                    time.sleep(delay)
                     continue
                 return {"ok": False, "error": str(e)}
 
@@ -67,11 +78,32 @@ class TelegramNotifier:
         }
 
         if reply_markup:
-            payload['reply_markup'] = json.dumps(reply_markup)
+            payload['reply_markup'] = orjson.dumps(reply_markup).decode()
 
-        files = {'photo': photo}
+        # Bytes rather than the stream, so a retry re-sends the whole image
+        files = {'photo': ('image.jpg', photo.getvalue(), 'image/jpeg')}
         return self._make_request('sendPhoto', payload, files)
 
+    def send_media_group(self, photos: List[Tuple[BytesIO, str]]) -> Dict:
+        """Send 2-10 captioned photos as one album (albums can't carry inline keyboards)"""
+        media = []
+        files = {}
+        for i, (photo, caption) in enumerate(photos):
+            name = f'photo{i}'
+            media.append({
+                'type': 'photo',
+                'media': f'attach://{name}',
+                'caption': caption,
+                'parse_mode': 'HTML'
+            })
+            files[name] = (f'{name}.jpg', photo.getvalue(), 'image/jpeg')
+
+        payload = {
+            'chat_id': self.chat_id,
+            'media': orjson.dumps(media).decode()
+        }
+        return self._make_request('sendMediaGroup', payload, files)
+
     def send_message(self, 
                     text: str, 
                     reply_markup: Optional[Dict] = None) -> Dict:
@@ -83,6 +115,6 @@ class TelegramNotifier:
         }
         
         if reply_markup:
-            payload['reply_markup'] = json.dumps(reply_markup)
+            payload['reply_markup'] = orjson.dumps(reply_markup).decode()
         
         return self._make_request('sendMessage', payload)
\ No newline at end of file